@@ -23,12 +23,18 @@ def create_app():
     db.init_app(app)
     migrate.init_app(app, db)
     jwt.init_app(app)
+
+    # Query counts and timings per request
+    from .profiling import init_request_metrics, init_request_profiling
+    init_request_profiling(app)
+    init_request_metrics(app)
     
     # Configure CORS with credentials support
     CORS(app, 
          origins=app.config['CORS_ORIGINS'],
          methods=app.config['CORS_METHODS'],
          allow_headers=app.config['CORS_HEADERS'],
+         expose_headers=app.config['CORS_EXPOSE_HEADERS'],
          supports_credentials=app.config['CORS_SUPPORTS_CREDENTIALS']
     )
     
@@ -40,5 +46,10 @@ def create_app():
     from .models import User
     from .models.studyset_model import StudySet
     from .models.flashcard_model import Flashcard
+    from .models.generation_cache_model import GenerationCacheEntry
+    from .models.generation_job_model import GenerationJob
+    from .models.review_state_model import ReviewState
+    from .models.review_event_model import ReviewEvent
+    from .models.user_stats_model import UserStats
     
     return app
\ No newline at end of file
@@ -1,29 +1,400 @@
+import csv
+import io
+import json
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from sqlalchemy import and_, case, cast, column, delete, func, insert, or_, select, tuple_, update, values
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION
 from app.models.flashcard_model import Flashcard
+from app.models.studyset_model import StudySet
+from app.models.review_state_model import ReviewState
 from app import db
+from app.controllers.generation_cache_controllers import get_cached_flashcards, store_cached_flashcards
+from app.controllers.response_cache_controllers import invalidate_cached_responses
+from app.controllers.stats_controllers import adjust_user_stats
+from app.controllers.studyset_controllers import bump_studyset_version
 from utils.flashly_bot import FlashlyBot
+from utils.pagination import encode_cursor, decode_cursor, encode_rank_cursor, decode_rank_cursor
+from utils.near_duplicates import NearDuplicateIndex, minhash
+from utils.scheduler import DEFAULT_EASE
 from flask import current_app
 
-def get_flashcards_by_studyset(studyset_id):
-    """Get all flashcards for a specific study set"""
-    flashcards = Flashcard.query.filter_by(studyset_id=studyset_id).all()
-    return [f.to_dict() for f in flashcards]
+STREAM_BATCH_SIZE = 500
+INSERT_CHUNK_SIZE = 1000
+COPY_THRESHOLD = 5000
+FLASHCARD_COLUMNS = (
+    'id', 'user_id', 'studyset_id', 'question', 'answer', 'is_ai_generated', 'minhash', 'created_at', 'updated_at'
+)
+EXPORT_COLUMNS = ('id', 'question', 'answer', 'created_at', 'updated_at')
+EXPORT_FORMATS = {'csv': 'text/csv', 'jsonl': 'application/x-ndjson'}
+# Spreadsheets evaluate a cell starting with one of these as a formula
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+REVIEW_STATE_COLUMNS = (
+    'user_id', 'flashcard_id', 'studyset_id', 'repetitions', 'interval_days', 'ease_factor',
+    'lapses', 'reviews_count', 'due_at'
+)
+
+def _flashcards_in_order(studyset_id):
+    return Flashcard.query.filter_by(studyset_id=studyset_id).order_by(
+        Flashcard.created_at, Flashcard.id
+    )
+
+def get_flashcards_by_studyset(studyset_id, limit=None, after=None):
+    """Get a page of flashcards for a specific study set, oldest first"""
+    query = _flashcards_in_order(studyset_id)
+
+    # Keyset pagination over (created_at, id)
+    if after:
+        after_created_at, after_id = decode_cursor(after)
+        query = query.filter(
+            tuple_(Flashcard.created_at, Flashcard.id) > tuple_(after_created_at, after_id)
+        )
+    if limit:
+        # Fetch one extra row to know whether another page exists
+        query = query.limit(limit + 1)
+
+    flashcards = query.all()
+    next_cursor = None
+    if limit and len(flashcards) > limit:
+        flashcards = flashcards[:limit]
+        next_cursor = encode_cursor(flashcards[-1].created_at, flashcards[-1].id)
+
+    return [f.to_dict() for f in flashcards], next_cursor
+
+def iter_flashcards_by_studyset(studyset_id):
+    """Yield flashcard dicts for a study set from a server-side cursor"""
+    query = _flashcards_in_order(studyset_id).yield_per(STREAM_BATCH_SIZE)
+    for flashcard in query:
+        yield flashcard.to_dict()
+
+def stream_studyset_json(studyset, studyset_id):
+    """Emit the same document as the buffered GET response, one flashcard at a time"""
+    yield '{"studyset": ' + json.dumps(studyset) + ', "flashcards": ['
+    for index, flashcard in enumerate(iter_flashcards_by_studyset(studyset_id)):
+        yield (',' if index else '') + json.dumps(flashcard)
+    yield '], "next_cursor": null}'
+
+def _iter_export_batches(studyset_id):
+    """Lists of export rows, STREAM_BATCH_SIZE at a time, from a server-side cursor"""
+    result = db.session.execute(
+        select(*(getattr(Flashcard, name) for name in EXPORT_COLUMNS))
+        .where(Flashcard.studyset_id == studyset_id)
+        .order_by(Flashcard.created_at, Flashcard.id)
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
+    )
+    for partition in result.partitions():
+        yield [{
+            'id': str(row.id),
+            'question': row.question,
+            'answer': row.answer,
+            'created_at': row.created_at.isoformat(),
+            'updated_at': row.updated_at.isoformat(),
+        } for row in partition]
+
+def stream_flashcards_export(studyset_id, export_format):
+    """Emit a study set's flashcards as CSV (with a header row) or JSON Lines, one chunk per batch"""
+    if export_format == 'csv':
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+        writer.writeheader()
+        yield buffer.getvalue()
+        for batch in _iter_export_batches(studyset_id):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(_escape_csv_formulas(row) for row in batch)
+            yield buffer.getvalue()
+    else:
+        for batch in _iter_export_batches(studyset_id):
+            yield ''.join(json.dumps(row) + '\n' for row in batch)
+
+def _escape_csv_formulas(row):
+    # A leading ' makes spreadsheets show the text as-is; only user-written fields can start this way
+    for name in ('question', 'answer'):
+        if row[name].startswith(CSV_FORMULA_PREFIXES):
+            row[name] = "'" + row[name]
+    return row
+
+def _iter_import_rows(file, import_format):
+    """Yield (line number, record) pairs from an uploaded CSV or JSON Lines file without reading it whole"""
+    text = io.TextIOWrapper(file.stream, encoding='utf-8-sig', newline='')
+    if import_format == 'csv':
+        # strict: a stray or unterminated quote is an error rather than silently merged text
+        reader = csv.DictReader(text, strict=True)
+        try:
+            if not reader.fieldnames or not {'question', 'answer'} <= set(reader.fieldnames):
+                raise ValueError("CSV needs a header row with question and answer columns")
+            for record in reader:
+                yield reader.line_num, record
+        except csv.Error as e:
+            # line_num counts the lines consumed before the one that failed
+            raise ValueError(f"Line {reader.line_num + 1}: malformed CSV ({e})")
+    else:
+        for line_number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Line {line_number}: invalid JSON ({e.msg})")
+            yield line_number, record
+
+def _parse_import_card(line_number, record):
+    if not isinstance(record, dict):
+        raise ValueError(f"Line {line_number}: expected an object with question and answer")
+    question, answer = record.get('question'), record.get('answer')
+    if not isinstance(question, str) or not isinstance(answer, str) or not question.strip() or not answer.strip():
+        raise ValueError(f"Line {line_number}: question and answer must be non-empty text")
+    if '\x00' in question or '\x00' in answer:
+        # Postgres text cannot hold NUL, and COPY would fail the whole import on it
+        raise ValueError(f"Line {line_number}: question and answer must not contain NUL characters")
+    return {'question': question, 'answer': answer}
+
+def import_flashcards(studyset_id, user_id, file, import_format):
+    """Load a CSV or JSON Lines deck into a study set in one transaction.
+
+    The upload is parsed as a stream and written in COPY_THRESHOLD-sized batches, so each batch
+    goes through COPY; memory holds one batch at a time. Cards are taken as-is, without the
+    near-duplicate check previews get. Hashing signatures would dominate the load time, so they
+    are left for fill_missing_signatures. Raises ValueError, and loads nothing, if any line is invalid.
+    """
+    max_rows = current_app.config['IMPORT_MAX_ROWS']
+    started_at = datetime.now()
+    try:
+        imported = 0
+        batch = []
+
+        def insert_batch():
+            # Timestamps continue across batches so the deck keeps its file order
+            return len(bulk_insert_flashcards(
+                studyset_id, user_id, batch, with_signatures=False,
+                started_at=started_at + timedelta(microseconds=imported)
+            ))
+
+        for line_number, record in _iter_import_rows(file, import_format):
+            batch.append(_parse_import_card(line_number, record))
+            if imported + len(batch) > max_rows:
+                raise ValueError(f"Imports are limited to {max_rows} flashcards")
+            if len(batch) >= COPY_THRESHOLD:
+                imported += insert_batch()
+                batch = []
+        if batch:
+            imported += insert_batch()
+
+        if imported:
+            bump_studyset_version(studyset_id)
+        db.session.commit()
+        invalidate_cached_responses(studyset_id, user_id)
+        return {'success': True, 'imported': imported}
+
+    except UnicodeDecodeError:
+        db.session.rollback()
+        raise ValueError("File is not UTF-8 text")
+    except Exception as e:
+        db.session.rollback()
+        raise e
+
+def search_flashcards(user_id, query_text, limit, after=None):
+    """Ranked full-text search over all of a user's flashcards.
+
+    The (user_id, search_vector) GIN index narrows matching to the user's own cards, and
+    pages are keyset on (rank, id) so a page never sorts and discards earlier pages. Ranking
+    is still computed over every match for the user: the sort itself cannot come from an index.
+    """
+    query = func.websearch_to_tsquery('english', query_text)
+    # ts_rank_cd returns real; compare as double so a cursor value round-trips exactly
+    rank_value = cast(func.ts_rank_cd(Flashcard.search_vector, query), DOUBLE_PRECISION)
+    rank = rank_value.label('rank')
+
+    search = db.session.query(
+        Flashcard.id,
+        Flashcard.user_id,
+        Flashcard.studyset_id,
+        Flashcard.question,
+        Flashcard.answer,
+        Flashcard.created_at,
+        Flashcard.updated_at,
+        StudySet.title.label('studyset_title'),
+        rank
+    ).join(
+        StudySet, StudySet.id == Flashcard.studyset_id
+    ).filter(
+        Flashcard.user_id == user_id,
+        Flashcard.search_vector.op('@@')(query)
+    )
+
+    # Keyset on (rank DESC, id ASC)
+    if after:
+        after_rank, after_id = decode_rank_cursor(after)
+        search = search.filter(or_(
+            rank_value < after_rank,
+            and_(rank_value == after_rank, Flashcard.id > after_id)
+        ))
+
+    rows = search.order_by(rank.desc(), Flashcard.id).limit(limit + 1).all()
+
+    hits = []
+    for row in rows[:limit]:
+        hit = Flashcard.row_to_dict(row)
+        hit['studyset_id'] = str(row.studyset_id)
+        hit['studyset_title'] = row.studyset_title
+        hit['rank'] = round(row.rank, 6)
+        hits.append(hit)
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode_rank_cursor(last.rank, last.id)
+
+    return {
+        'results': hits,
+        'next_cursor': next_cursor
+    }
+
+def _serialized_columns(table):
+    return [table.c[name] for name in Flashcard.SERIALIZED_COLUMNS]
+
+def copy_rows(table_name, columns, rows):
+    """Load rows with a single COPY ... FROM STDIN on the session's connection"""
+    buffer = io.StringIO()
+    # COPY reads an unquoted empty field as NULL: quote everything but None so '' stays an empty string
+    writer = csv.writer(buffer, quoting=csv.QUOTE_NOTNULL)
+    for row in rows:
+        # bytea goes through CSV in Postgres hex format
+        writer.writerow([
+            '\\x' + row[column].hex() if isinstance(row[column], bytes) else row[column]
+            for column in columns
+        ])
+    buffer.seek(0)
+
+    # Raw DBAPI cursor on the same connection, so COPY joins the session transaction
+    cursor = db.session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table_name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+    finally:
+        cursor.close()
+
+def _new_review_states(rows):
+    """A fresh review state per new card, due immediately"""
+    return [{
+        'user_id': row['user_id'],
+        'flashcard_id': row['id'],
+        'studyset_id': row['studyset_id'],
+        'repetitions': 0,
+        'interval_days': 0.0,
+        'ease_factor': DEFAULT_EASE,
+        'lapses': 0,
+        'reviews_count': 0,
+        'due_at': row['created_at'],
+    } for row in rows]
+
+def bulk_insert_flashcards(studyset_id, user_id, flashcards_data, ai_generated=False, with_signatures=True, started_at=None):
+    """Insert flashcards in chunked multi-row statements, one round trip per chunk.
+
+    Each card gets its review state, and the user's stats their new counts, in the same transaction.
+    with_signatures=False leaves minhash NULL for fill_missing_signatures to compute later.
+    started_at is the first card's timestamp (default now), for callers inserting one list in several calls.
+    Does not commit; callers own the transaction.
+    """
+    now = started_at or datetime.now()
+    # One microsecond apart: ids are random, so (created_at, id) ordering needs distinct timestamps to keep input order
+    rows = [{
+        'id': uuid.uuid4(),
+        'user_id': user_id,
+        'studyset_id': studyset_id,
+        'question': card_data['question'],
+        'answer': card_data['answer'],
+        'is_ai_generated': ai_generated,
+        'minhash': minhash(card_data['question']) if with_signatures else None,
+        'created_at': now + timedelta(microseconds=position),
+        'updated_at': now + timedelta(microseconds=position),
+    } for position, card_data in enumerate(flashcards_data)]
+
+    if not rows:
+        return []
+    adjust_user_stats(user_id, studyset_id, cards=len(rows), ai_cards=len(rows) if ai_generated else 0)
+
+    if len(rows) >= COPY_THRESHOLD and db.session.get_bind().dialect.driver == 'psycopg2':
+        # COPY can't return rows, but every value was generated here
+        copy_rows(Flashcard.__tablename__, FLASHCARD_COLUMNS, rows)
+        copy_rows(ReviewState.__tablename__, REVIEW_STATE_COLUMNS, _new_review_states(rows))
+        return [Flashcard.row_to_dict(SimpleNamespace(**row)) for row in rows]
+
+    table = Flashcard.__table__
+    created = []
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        chunk = rows[start:start + INSERT_CHUNK_SIZE]
+        result = db.session.execute(insert(table).values(chunk).returning(*_serialized_columns(table)))
+        created.extend(Flashcard.row_to_dict(row) for row in result)
+        db.session.execute(insert(ReviewState.__table__).values(_new_review_states(chunk)))
+    return created
+
+def fill_missing_signatures(studyset_id):
+    """Compute and store minhash for cards saved without one, committing every INSERT_CHUNK_SIZE cards"""
+    table = Flashcard.__table__
+    while True:
+        rows = db.session.execute(
+            select(table.c.id, table.c.question)
+            .where(table.c.studyset_id == studyset_id, table.c.minhash.is_(None))
+            .limit(INSERT_CHUNK_SIZE)
+        ).all()
+        if not rows:
+            return
+        signatures = values(
+            column('id', table.c.id.type),
+            column('minhash', table.c.minhash.type),
+            name='signatures'
+        ).data([(row.id, minhash(row.question)) for row in rows])
+        db.session.execute(
+            update(table).where(
+                table.c.id == cast(signatures.c.id, table.c.id.type)
+            ).values(
+                minhash=signatures.c.minhash,
+                # Not an edit: keep the card's timestamp
+                updated_at=table.c.updated_at
+            )
+        )
+        db.session.commit()
+
+def load_near_duplicate_index(studyset_id):
+    """LSH index over the signatures of every card already in the study set"""
+    index = NearDuplicateIndex()
+    rows = db.session.query(
+        Flashcard.id,
+        Flashcard.minhash,
+        # Question text is only needed for rows saved before signatures existed
+        case((Flashcard.minhash.is_(None), Flashcard.question), else_=None).label('question')
+    ).filter(Flashcard.studyset_id == studyset_id)
+    for row in rows:
+        index.add(str(row.id), row.minhash or minhash(row.question))
+    return index
+
+def match_near_duplicates(studyset_id, flashcards_data):
+    """Pair each card with the key of a near-duplicate, or None, in one pass.
+
+    Keys are existing flashcard ids, or 'new:<position>' for an earlier card in the batch.
+    """
+    index = load_near_duplicate_index(studyset_id)
+    matches = []
+    for position, card in enumerate(flashcards_data):
+        signature = minhash(card['question'])
+        match = index.find(signature)
+        if match is None:
+            index.add(f"new:{position}", signature)
+        matches.append((card, match))
+    return matches
 
 def create_flashcards(studyset_id, user_id, flashcards_data):
     """Create multiple flashcards for an existing study set"""
     try:
-        flashcards = []
-        for card_data in flashcards_data:
-            flashcard = Flashcard(
-                user_id=user_id,
-                studyset_id=studyset_id,
-                question=card_data['question'],
-                answer=card_data['answer']
-            )
-            flashcards.append(flashcard)
-            db.session.add(flashcard)
-        
+        flashcards = bulk_insert_flashcards(studyset_id, user_id, flashcards_data)
+        bump_studyset_version(studyset_id)
         db.session.commit()
-        return [f.to_dict() for f in flashcards]
+        invalidate_cached_responses(studyset_id, user_id)
+        return flashcards
         
     except Exception as e:
         db.session.rollback()
@@ -34,103 +405,232 @@ def preview_flashcards_from_file(studyset_id, user_id, file):
     try:
         bot = FlashlyBot()
         
-        # Extract text and generate flashcards data
+        # Extract text, then reuse an earlier generation for identical content
         text = bot.extract_text(file)
-        flashcards_data = bot.generate_flashcards(text)
+        cache_key = bot.cache_key(text)
+        flashcards_data = get_cached_flashcards(cache_key)
+        cached = flashcards_data is not None
+        
+        if not cached:
+            flashcards_data = bot.generate_flashcards(text)
+            if flashcards_data:
+                store_cached_flashcards(cache_key, flashcards_data)
         
         if not flashcards_data:
             raise ValueError("Failed to generate flashcards from file")
         
+        # Drop near-duplicates within the batch; flag ones the set already has
+        flashcards_data = [
+            {**card, 'duplicate_of': match} if match else card
+            for card, match in match_near_duplicates(studyset_id, flashcards_data)
+            if not (match and match.startswith('new:'))
+        ]
+        
         # Return preview data without saving to database
         return {
             'success': True,
             'preview': True,
+            'cached': cached,
+            'duplicates_count': sum(1 for card in flashcards_data if 'duplicate_of' in card),
             'flashcards_count': len(flashcards_data),
             'flashcards': flashcards_data,  # Raw data, no UUIDs yet
-            'source_file': file.filename
+            'source_file': file.filename,
+            'extraction_report': bot.last_extraction_report,  # Per-page timings
+            'generation_report': bot.last_generation_report  # Per-chunk timings
         }
         
     except Exception as e:
         raise e
     
-def save_preview_flashcards(studyset_id, user_id, flashcards_data):
-    """Save previewed flashcards to database after user approval"""
+def _sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def prepare_preview_stream(studyset_id, user_id, file):
+    """Extract the upload up front and return the SSE generator for its preview.
+
+    Runs before the response starts, so unsupported or unreadable files raise ValueError
+    while the route can still answer 400.
+    """
+    bot = FlashlyBot()
+    text = bot.extract_text(file)
+    if not text.strip():
+        raise ValueError("Could not extract any text from the file")
+    return stream_preview_flashcards(bot, studyset_id, text, file.filename)
+
+def stream_preview_flashcards(bot, studyset_id, text, filename):
+    """Generate a flashcards preview as Server-Sent Events, one card per event.
+
+    Headers are already sent by the time this runs, so failures become an 'error' event.
+    """
     try:
-        flashcards = []
-        for card_data in flashcards_data:
-            flashcard = Flashcard(
-                user_id=user_id,
-                studyset_id=studyset_id,
-                question=card_data['question'],
-                answer=card_data['answer']
-            )
-            flashcards.append(flashcard)
-            db.session.add(flashcard)
-        
+        yield from _preview_events(bot, studyset_id, text, filename)
+    except Exception as e:
+        current_app.logger.error(f"❌ Error streaming preview: {str(e)}")
+        yield _sse_event('error', {'error': str(e)})
+
+def _preview_events(bot, studyset_id, text, filename):
+    cache_key = bot.cache_key(text)
+
+    flashcards_data = get_cached_flashcards(cache_key)
+    cached = flashcards_data is not None
+    cards = flashcards_data if cached else bot.stream_flashcards(text)
+
+    # Same near-duplicate rules as the buffered preview, applied card by card
+    index = load_near_duplicate_index(studyset_id)
+    generated = []
+    emitted = 0
+    for position, card in enumerate(cards):
+        generated.append(card)
+        signature = minhash(card['question'])
+        match = index.find(signature)
+        if match is None:
+            index.add(f"new:{position}", signature)
+        elif match.startswith('new:'):
+            continue
+        else:
+            card = {**card, 'duplicate_of': match}
+        emitted += 1
+        yield _sse_event('card', card)
+
+    flashcards_data = generated
+    if flashcards_data and not cached:
+        store_cached_flashcards(cache_key, flashcards_data)
+
+    if not flashcards_data:
+        yield _sse_event('error', {'error': 'Failed to generate flashcards from file'})
+        return
+
+    yield _sse_event('done', {
+        'success': True,
+        'preview': True,
+        'cached': cached,
+        'flashcards_count': emitted,
+        'source_file': filename
+    })
+
+def save_preview_flashcards(studyset_id, user_id, flashcards_data, allow_duplicates=True):
+    """Save previewed flashcards to database after user approval.
+
+    The preview already flagged near-duplicates, so every approved card is kept unless
+    allow_duplicates is False.
+    """
+    try:
+        skipped = 0
+        if not allow_duplicates:
+            matches = match_near_duplicates(studyset_id, flashcards_data)
+            flashcards_data = [card for card, match in matches if match is None]
+            skipped = len(matches) - len(flashcards_data)
+
+        flashcards = bulk_insert_flashcards(studyset_id, user_id, flashcards_data, ai_generated=True)
+        bump_studyset_version(studyset_id)
         db.session.commit()
+        invalidate_cached_responses(studyset_id, user_id)
         return {
             'success': True,
             'saved': True,
-            'flashcards': [f.to_dict() for f in flashcards]
+            'skipped_duplicates': skipped,
+            'flashcards': flashcards
         }
         
     except Exception as e:
         db.session.rollback()
         raise e
 
+def bulk_update_flashcards(studyset_id, user_id, cards):
+    """Apply question/answer edits with one UPDATE ... FROM (VALUES ...) per chunk.
+
+    Rows whose content is unchanged are left alone. Returns the rows actually written.
+    Does not commit; callers own the transaction.
+    """
+    table = Flashcard.__table__
+    now = datetime.now()
+    updated = []
+    for start in range(0, len(cards), INSERT_CHUNK_SIZE):
+        chunk = cards[start:start + INSERT_CHUNK_SIZE]
+        edits = values(
+            column('id', table.c.id.type),
+            column('question', table.c.question.type),
+            column('answer', table.c.answer.type),
+            column('minhash', table.c.minhash.type),
+            name='edits'
+        ).data([
+            (card['id'], card['question'], card['answer'], minhash(card['question']))
+            for card in chunk
+        ])
+
+        statement = update(table).where(
+            # VALUES literals arrive untyped, so the id needs an explicit cast
+            table.c.id == cast(edits.c.id, table.c.id.type),
+            table.c.studyset_id == studyset_id,
+            table.c.user_id == user_id,
+            or_(
+                table.c.question.is_distinct_from(edits.c.question),
+                table.c.answer.is_distinct_from(edits.c.answer)
+            )
+        ).values(
+            question=edits.c.question,
+            answer=edits.c.answer,
+            minhash=edits.c.minhash,
+            updated_at=now
+        ).returning(*_serialized_columns(table))
+
+        updated.extend(Flashcard.row_to_dict(row) for row in db.session.execute(statement))
+    return updated
+
 def update_flashcards(studyset_id, user_id, data):
-    """Bulk update flashcards for a study set"""
+    """Bulk update flashcards for a study set.
+
+    Returns only the rows that were created or changed, unless data['return_all'] is set.
+    """
     try:
         # 1. DELETE: Remove flashcards marked for deletion
+        deleted_ids = []
         delete_ids = data.get('delete_ids', [])
         if delete_ids:
-            Flashcard.query.filter(
-                Flashcard.id.in_(delete_ids),
-                Flashcard.studyset_id == studyset_id,
-                Flashcard.user_id == user_id
-            ).delete(synchronize_session=False)
-
-        # 2. UPDATE & CREATE: Process flashcards array
-        updated_flashcards = []
+            table = Flashcard.__table__
+            result = db.session.execute(
+                delete(table).where(
+                    table.c.id.in_(delete_ids),
+                    table.c.studyset_id == studyset_id,
+                    table.c.user_id == user_id
+                ).returning(table.c.id, table.c.is_ai_generated)
+            )
+            deleted = result.all()
+            deleted_ids = [str(row.id) for row in deleted]
+            if deleted:
+                adjust_user_stats(
+                    user_id, studyset_id,
+                    cards=-len(deleted), ai_cards=-sum(1 for row in deleted if row.is_ai_generated)
+                )
+
+        # 2. Split the flashcards array: a real id means update, no id or a temp_ id means create
+        existing_cards = []
+        new_cards = []
         for card_data in data.get('flashcards', []):
-            
-            # ✅ FIX: Check if ID exists AND is not a temporary ID
-            if ('id' in card_data and 
-                card_data['id'] and 
-                not str(card_data['id']).startswith('temp_')):
-                
-                # UPDATE existing flashcard
-                flashcard = Flashcard.query.filter_by(
-                    id=card_data['id'],
-                    studyset_id=studyset_id,
-                    user_id=user_id
-                ).first()
-                
-                if flashcard:
-                    flashcard.question = card_data['question']
-                    flashcard.answer = card_data['answer']
-                    updated_flashcards.append(flashcard)
-            
+            if card_data.get('id') and not str(card_data['id']).startswith('temp_'):
+                existing_cards.append(card_data)
             else:
-                # CREATE new flashcard (no valid id means new)
-                new_flashcard = Flashcard(
-                    user_id=user_id,
-                    studyset_id=studyset_id,
-                    question=card_data['question'],
-                    answer=card_data['answer']
-                )
-                db.session.add(new_flashcard)
-                updated_flashcards.append(new_flashcard)
+                new_cards.append(card_data)
 
-        # 3. COMMIT all changes in one transaction
+        # 3. UPDATE & CREATE: one set-based statement per chunk each
+        changed_flashcards = bulk_update_flashcards(studyset_id, user_id, existing_cards)
+        changed_flashcards.extend(bulk_insert_flashcards(studyset_id, user_id, new_cards))
+
+        # 4. COMMIT all changes in one transaction
+        if deleted_ids or changed_flashcards:
+            bump_studyset_version(studyset_id)
         db.session.commit()
-        
-        # 4. Return updated flashcards for the studyset
-        final_flashcards = Flashcard.query.filter_by(studyset_id=studyset_id).all()
-        
+        invalidate_cached_responses(studyset_id, user_id)
+
+        if data.get('return_all'):
+            flashcards, _ = get_flashcards_by_studyset(studyset_id)
+        else:
+            flashcards = changed_flashcards
+
         return {
             'success': True,
-            'flashcards': [f.to_dict() for f in final_flashcards]
+            'flashcards': flashcards,
+            'deleted_ids': deleted_ids
         }
         
     except Exception as e:
@@ -145,8 +645,12 @@ def delete_flashcard(flashcard_id):
         if not flashcard:
             return False
         
+        studyset_id, user_id = flashcard.studyset_id, flashcard.user_id
         db.session.delete(flashcard)
+        adjust_user_stats(user_id, studyset_id, cards=-1, ai_cards=-1 if flashcard.is_ai_generated else 0)
+        bump_studyset_version(studyset_id)
         db.session.commit()
+        invalidate_cached_responses(studyset_id, user_id)
         return True
     except Exception as e:
         db.session.rollback()
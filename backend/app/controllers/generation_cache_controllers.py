@@ -0,0 +1,107 @@
+import threading
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import delete, select, update
+from app.models.generation_cache_model import GenerationCacheEntry
+from app import db
+from utils.lru_cache import LRUCache
+from utils.metrics import record_cache_lookup
+
+_memory_cache = None
+_memory_cache_lock = threading.Lock()
+_db_stats = {'hits': 0, 'misses': 0}
+_db_stats_lock = threading.Lock()
+
+def _get_memory_cache():
+    global _memory_cache
+    if _memory_cache is None:
+        with _memory_cache_lock:
+            if _memory_cache is None:
+                # Same lifetime as the database rows, so a worker never serves an expired entry
+                _memory_cache = LRUCache(
+                    maxsize=current_app.config['GENERATION_CACHE_MEMORY_SIZE'],
+                    ttl=current_app.config['GENERATION_CACHE_TTL'],
+                    name='generation_memory'
+                )
+    return _memory_cache
+
+def _count_db(outcome):
+    with _db_stats_lock:
+        _db_stats[outcome] += 1
+    record_cache_lookup('generation_db', outcome == 'hits')
+
+def get_cached_flashcards(key):
+    """Look up generated flashcards by content key: memory first, then the database"""
+    memory_cache = _get_memory_cache()
+    flashcards = memory_cache.get(key)
+    if flashcards is not None:
+        return flashcards
+
+    try:
+        ttl_cutoff = datetime.now() - timedelta(seconds=current_app.config['GENERATION_CACHE_TTL'])
+        entry = db.session.execute(
+            update(GenerationCacheEntry)
+            .where(GenerationCacheEntry.key == key, GenerationCacheEntry.created_at > ttl_cutoff)
+            .values(last_accessed_at=datetime.now())
+            .returning(GenerationCacheEntry.flashcards, GenerationCacheEntry.created_at)
+        ).first()
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"❌ Generation cache lookup failed: {str(e)}")
+        return None
+
+    if entry is None:
+        _count_db('misses')
+        return None
+
+    _count_db('hits')
+    # Only for what is left of the row's lifetime
+    memory_cache.set(key, entry.flashcards, ttl=(entry.created_at - ttl_cutoff).total_seconds())
+    return entry.flashcards
+
+def store_cached_flashcards(key, flashcards):
+    """Save generated flashcards under their content key, then evict expired and excess rows"""
+    _get_memory_cache().set(key, flashcards)
+
+    try:
+        entry = db.session.get(GenerationCacheEntry, key) or GenerationCacheEntry(key=key)
+        entry.flashcards = flashcards
+        entry.flashcards_count = len(flashcards)
+        entry.created_at = datetime.now()
+        entry.last_accessed_at = datetime.now()
+        db.session.add(entry)
+
+        # TTL eviction
+        ttl_cutoff = datetime.now() - timedelta(seconds=current_app.config['GENERATION_CACHE_TTL'])
+        db.session.execute(
+            delete(GenerationCacheEntry).where(GenerationCacheEntry.created_at <= ttl_cutoff),
+            execution_options={"synchronize_session": False}
+        )
+
+        # Size eviction: drop everything past the most recently used entries
+        evicted = select(GenerationCacheEntry.key).order_by(
+            GenerationCacheEntry.last_accessed_at.desc()
+        ).offset(current_app.config['GENERATION_CACHE_MAX_ENTRIES'])
+        db.session.execute(
+            delete(GenerationCacheEntry).where(GenerationCacheEntry.key.in_(evicted)),
+            execution_options={"synchronize_session": False}
+        )
+
+        db.session.commit()
+    except Exception as e:
+        # The cache is an optimization; a failed write must not fail the preview
+        db.session.rollback()
+        current_app.logger.error(f"❌ Generation cache store failed: {str(e)}")
+
+def get_generation_cache_stats():
+    """Hit/miss counts for both cache tiers in this worker process"""
+    with _db_stats_lock:
+        db_stats = dict(_db_stats)
+    lookups = db_stats['hits'] + db_stats['misses']
+    db_stats['hit_ratio'] = round(db_stats['hits'] / lookups, 4) if lookups else 0.0
+    db_stats['entries'] = db.session.query(GenerationCacheEntry).count()
+    return {
+        'memory': _get_memory_cache().stats(),
+        'database': db_stats
+    }
@@ -0,0 +1,139 @@
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import update
+from werkzeug.datastructures import FileStorage
+from app.models.generation_job_model import GenerationJob
+from app.controllers.flashcard_controllers import fill_missing_signatures, preview_flashcards_from_file
+from app import db
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+def _get_executor():
+    """Per-process job pool, rebuilt after a fork so each gunicorn worker owns its threads"""
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(
+                max_workers=current_app.config['GENERATION_JOB_WORKERS'],
+                thread_name_prefix='generation-job'
+            )
+            _executor_pid = os.getpid()
+    return _executor
+
+def enqueue_preview_job(studyset_id, user_id, file):
+    """Record a preview job and hand the upload to the local worker pool"""
+    try:
+        job = GenerationJob(
+            user_id=user_id,
+            studyset_id=studyset_id,
+            source_file=file.filename
+        )
+        db.session.add(job)
+        db.session.commit()
+        job_dict = job.to_dict()
+    except Exception as e:
+        db.session.rollback()
+        raise e
+
+    # The request stream is gone once we return, so the upload is spooled to disk for the worker
+    with tempfile.NamedTemporaryFile(prefix='flashly-job-', delete=False) as spool:
+        file.save(spool)
+    _get_executor().submit(
+        _run_preview_job,
+        current_app._get_current_object(),
+        job.id,
+        studyset_id,
+        user_id,
+        file.filename,
+        spool.name
+    )
+    return job_dict
+
+def _run_preview_job(app, job_id, studyset_id, user_id, filename, path):
+    try:
+        with app.app_context():
+            try:
+                _execute_preview_job(app, job_id, studyset_id, user_id, filename, path)
+            except Exception as e:
+                # Nothing above the pool would log this; the job is left for get_job to time out
+                db.session.rollback()
+                app.logger.error(f"❌ Preview job {job_id} crashed: {str(e)}")
+            finally:
+                db.session.remove()
+    finally:
+        os.remove(path)
+
+def _transition_job(job_id, from_statuses, *criteria, **values):
+    """Update a job only while it is in one of from_statuses; returns whether it was updated.
+
+    Every status write goes through here, so the worker and the timeout in get_job cannot
+    overwrite each other: whichever commits first wins and the other updates no row.
+    """
+    try:
+        result = db.session.execute(
+            update(GenerationJob)
+            .where(GenerationJob.id == job_id, GenerationJob.status.in_(from_statuses), *criteria)
+            .values(**values)
+        )
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        raise e
+    return result.rowcount == 1
+
+def _execute_preview_job(app, job_id, studyset_id, user_id, filename, path):
+    if not _transition_job(job_id, ('queued',), status='running', started_at=datetime.now()):
+        # Deleted, or already failed by the timeout while it waited in the queue
+        return
+
+    try:
+        with open(path, 'rb') as stream:
+            file = FileStorage(stream=stream, filename=filename)
+            outcome = {'status': 'succeeded', 'result': preview_flashcards_from_file(studyset_id, user_id, file)}
+    except Exception as e:
+        db.session.rollback()
+        outcome = {'status': 'failed', 'error': str(e)}
+        app.logger.error(f"❌ Preview job {job_id} failed: {str(e)}")
+
+    if not _transition_job(job_id, ('running',), finished_at=datetime.now(), **outcome):
+        app.logger.warning(f"⏱️ Preview job {job_id} finished after it timed out; its outcome was discarded")
+
+def enqueue_signature_backfill(studyset_id):
+    """Compute near-duplicate signatures for freshly imported cards on the local worker pool"""
+    _get_executor().submit(_run_signature_backfill, current_app._get_current_object(), studyset_id)
+
+def _run_signature_backfill(app, studyset_id):
+    with app.app_context():
+        try:
+            fill_missing_signatures(studyset_id)
+        except Exception as e:
+            db.session.rollback()
+            app.logger.error(f"❌ Signature backfill for study set {studyset_id} failed: {str(e)}")
+        finally:
+            db.session.remove()
+
+def get_job(job_id, user_id):
+    """Get a job owned by the user, failing it if its worker went away"""
+    job = GenerationJob.query.filter_by(id=job_id, user_id=user_id).first()
+    if not job:
+        return None
+
+    timeout = timedelta(seconds=current_app.config['GENERATION_JOB_TIMEOUT'])
+    if not job.is_finished() and job.updated_at < datetime.now() - timeout:
+        # Re-checked in the UPDATE, so a worker that just moved the job on keeps it
+        _transition_job(
+            job.id,
+            ('queued', 'running'),
+            GenerationJob.updated_at < datetime.now() - timeout,
+            status='failed',
+            error='Job timed out',
+            finished_at=datetime.now()
+        )
+
+    return job.to_dict()
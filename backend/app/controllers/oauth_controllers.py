@@ -72,7 +72,7 @@ def oauth2_callback(provider):
             'code': request.args['code'],
             'grant_type': 'authorization_code',
             'redirect_uri': f"{request.host_url.rstrip('/')}/oauth/callback/{provider}",
-        }, headers={'Accept': 'application/json'})
+        }, headers={'Accept': 'application/json'}, timeout=current_app.config['OAUTH_HTTP_TIMEOUT'])
 
         if response.status_code != 200:
             return redirect(f"{os.getenv('FRONTEND_URL')}/auth/login?error=token_exchange_failed")
@@ -119,7 +119,7 @@ def get_user_info(provider, provider_data, access_token):
         response = requests.get(provider_data['userinfo']['url'], headers={
             'Authorization': 'Bearer ' + access_token,
             'Accept': 'application/json',
-        })
+        }, timeout=current_app.config['OAUTH_HTTP_TIMEOUT'])
 
         if response.status_code != 200:
             return None
@@ -133,7 +133,7 @@ def get_user_info(provider, provider_data, access_token):
                 email_response = requests.get(provider_data['userinfo']['email_url'], headers={
                     'Authorization': 'Bearer ' + access_token,
                     'Accept': 'application/json',
-                })
+                }, timeout=current_app.config['OAUTH_HTTP_TIMEOUT'])
                 if email_response.status_code == 200:
                     emails = email_response.json()
                     # Find primary verified email
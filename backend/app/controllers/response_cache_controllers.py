@@ -0,0 +1,85 @@
+import hashlib
+import threading
+from flask import Response, current_app, request
+from utils.lru_cache import LRUCache
+from utils.metrics import record_cache_lookup
+
+# Response headers that belong to the cached body and must be replayed on a hit
+CACHED_HEADERS = ('X-Next-Cursor',)
+
+# A scope (one study set, or one user's listing) keeps at most this many query-string variants
+MAX_VARIANTS_PER_SCOPE = 8
+
+_body_cache = None
+_body_cache_lock = threading.Lock()
+
+def _get_body_cache():
+    global _body_cache
+    if _body_cache is None:
+        with _body_cache_lock:
+            if _body_cache is None:
+                _body_cache = LRUCache(maxsize=current_app.config['RESPONSE_CACHE_SIZE'])
+    return _body_cache
+
+def studyset_scope(studyset_id):
+    return ('studyset', str(studyset_id))
+
+def studysets_scope(user_id):
+    return ('studysets', str(user_id))
+
+def make_etag(*parts):
+    """Strong validator over a version stamp and everything else that shapes the body"""
+    return hashlib.sha256('|'.join(str(part) for part in parts).encode()).hexdigest()[:32]
+
+def _finish(response, etag):
+    response.set_etag(etag)
+    # Let browsers keep the body but revalidate it on every use
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def not_modified(etag):
+    """A 304 if the client already holds `etag`, else None"""
+    if request.if_none_match.contains(etag):
+        return _finish(Response(status=304), etag)
+    return None
+
+def cached_json_response(scope, etag, build):
+    """Serve a JSON body for `etag` from the client (304), this worker's cache, or `build()`.
+
+    `build` returns anything a view may return; only 200s are cached. Version stamps are part of the
+    etag, so an entry written by a stale read can never be served for newer data.
+    """
+    response = not_modified(etag)
+    if response is not None:
+        return response
+
+    body_cache = _get_body_cache()
+    variants = body_cache.get(scope) or {}
+    cached = variants.get(etag)
+    # Counted per body rather than per scope: a scope holding only stale versions is a miss
+    record_cache_lookup('response_bodies', cached is not None)
+    if cached is not None:
+        body, headers = cached
+        return _finish(Response(body, mimetype='application/json', headers=headers), etag)
+
+    response = current_app.make_response(build())
+    if response.status_code == 200:
+        headers = {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers}
+        # Copy-on-write so concurrent readers never see a dict being resized
+        variants = dict(list(variants.items())[-(MAX_VARIANTS_PER_SCOPE - 1):])
+        variants[etag] = (response.get_data(), headers)
+        body_cache.set(scope, variants)
+        _finish(response, etag)
+    return response
+
+def invalidate_cached_responses(studyset_id=None, user_id=None):
+    """Drop this worker's cached bodies for a study set and/or a user's listing"""
+    body_cache = _get_body_cache()
+    if studyset_id is not None:
+        body_cache.delete(studyset_scope(studyset_id))
+    if user_id is not None:
+        body_cache.delete(studysets_scope(user_id))
+
+def get_response_cache_stats():
+    """Occupancy and per-scope hit/miss counts for cached GET bodies in this worker process"""
+    return _get_body_cache().stats()
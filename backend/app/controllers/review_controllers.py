@@ -0,0 +1,309 @@
+import atexit
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+from flask import current_app
+from sqlalchemy import cast, column, insert, select, tuple_, update, values
+from sqlalchemy.exc import OperationalError
+from app.models import Flashcard, ReviewEvent, ReviewState
+from app import db
+from app.controllers.flashcard_controllers import COPY_THRESHOLD, INSERT_CHUNK_SIZE, copy_rows
+from utils.metrics import REVIEW_EVENTS, REVIEW_FLUSH_SECONDS
+from utils.scheduler import next_review, parse_grade
+
+REVIEW_EVENT_COLUMNS = ('id', 'user_id', 'flashcard_id', 'studyset_id', 'grade', 'reviewed_at')
+SCHEDULE_COLUMNS = ('repetitions', 'interval_days', 'ease_factor', 'lapses', 'reviews_count', 'due_at', 'last_reviewed_at')
+# While the database is unreachable, failed batches go back in the buffer up to this many flushes' worth
+MAX_BUFFERED_FLUSHES = 20
+
+_buffer = None
+_buffer_pid = None
+_buffer_lock = threading.Lock()
+
+def _review_columns():
+    return [getattr(ReviewState, name) for name in ReviewState.SERIALIZED_COLUMNS]
+
+def get_due_flashcards(studyset_id, user_id, limit, now=None):
+    """The next `limit` cards due for review in a study set, most overdue first.
+
+    A range scan of ix_review_states_user_id_studyset_id_due_at that stops after `limit` rows,
+    so the cost does not grow with the size of the set.
+    """
+    now = now or datetime.now()
+    rows = db.session.execute(
+        select(
+            Flashcard.id, Flashcard.user_id, Flashcard.question, Flashcard.answer,
+            Flashcard.created_at, Flashcard.updated_at, *_review_columns()
+        ).join(
+            Flashcard, Flashcard.id == ReviewState.flashcard_id
+        ).where(
+            ReviewState.user_id == user_id,
+            ReviewState.studyset_id == studyset_id,
+            ReviewState.due_at <= now
+        ).order_by(
+            # due_at alone, so the index order is the result order and no sort step runs
+            ReviewState.due_at
+        ).limit(limit)
+    )
+    return [{**Flashcard.row_to_dict(row), 'review': ReviewState.row_to_dict(row)} for row in rows]
+
+def _review_event(studyset_id, user_id, flashcard_id, grade, reviewed_at):
+    return {
+        'id': uuid.uuid4(),
+        'user_id': uuid.UUID(str(user_id)),
+        'flashcard_id': uuid.UUID(str(flashcard_id)),
+        'studyset_id': uuid.UUID(str(studyset_id)),
+        'grade': grade,
+        'reviewed_at': reviewed_at,
+    }
+
+def _parse_reviewed_at(value, now):
+    if value is None:
+        return now
+    reviewed_at = datetime.fromisoformat(value)
+    if reviewed_at.tzinfo is not None:
+        reviewed_at = reviewed_at.astimezone().replace(tzinfo=None)
+    # A fast client clock must not push cards further out than the server would
+    return min(reviewed_at, now)
+
+def parse_review_events(studyset_id, user_id, items, now=None):
+    """Validate a batch of {flashcard_id, grade, reviewed_at?} items; raises ValueError on the first bad one"""
+    now = now or datetime.now()
+    if not isinstance(items, list) or not items:
+        raise ValueError("No reviews provided")
+    batch_max = current_app.config['REVIEW_BATCH_MAX']
+    if len(items) > batch_max:
+        raise ValueError(f"At most {batch_max} reviews per request")
+
+    events = []
+    for position, item in enumerate(items):
+        try:
+            events.append(_review_event(
+                studyset_id, user_id, item['flashcard_id'],
+                parse_grade(item.get('grade')),
+                _parse_reviewed_at(item.get('reviewed_at'), now)
+            ))
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid review at position {position}: {e}")
+    return events
+
+def find_unknown_flashcards(studyset_id, user_id, events):
+    """Ids in a parsed batch that have no review state in this study set, as sorted strings.
+
+    One lookup on the (user_id, flashcard_id) primary key, so a bad batch is rejected before it is
+    buffered rather than skipped silently at flush time.
+    """
+    flashcard_ids = {event['flashcard_id'] for event in events}
+    known = set(db.session.execute(
+        select(ReviewState.flashcard_id).where(
+            ReviewState.user_id == uuid.UUID(str(user_id)),
+            ReviewState.studyset_id == uuid.UUID(str(studyset_id)),
+            ReviewState.flashcard_id.in_(flashcard_ids)
+        )
+    ).scalars())
+    return sorted(str(flashcard_id) for flashcard_id in flashcard_ids - known)
+
+def _lock_review_states(pairs):
+    """Current state rows for (user_id, flashcard_id) pairs, locked for the rest of the transaction"""
+    table = ReviewState.__table__
+    states = {}
+    for start in range(0, len(pairs), INSERT_CHUNK_SIZE):
+        chunk = pairs[start:start + INSERT_CHUNK_SIZE]
+        rows = db.session.execute(
+            select(table).where(
+                tuple_(table.c.user_id, table.c.flashcard_id).in_(chunk)
+            ).order_by(
+                # One lock order for every flush, so concurrent workers can't deadlock
+                table.c.user_id, table.c.flashcard_id
+            ).with_for_update()
+        )
+        states.update({(row.user_id, row.flashcard_id): row._asdict() for row in rows})
+    return states
+
+def _insert_review_events(events):
+    if len(events) >= COPY_THRESHOLD and db.session.get_bind().dialect.driver == 'psycopg2':
+        copy_rows(ReviewEvent.__tablename__, REVIEW_EVENT_COLUMNS, events)
+        return
+    for start in range(0, len(events), INSERT_CHUNK_SIZE):
+        db.session.execute(insert(ReviewEvent.__table__).values(events[start:start + INSERT_CHUNK_SIZE]))
+
+def _update_review_states(states):
+    """Write new schedules with one UPDATE ... FROM (VALUES ...) per chunk"""
+    table = ReviewState.__table__
+    for start in range(0, len(states), INSERT_CHUNK_SIZE):
+        chunk = states[start:start + INSERT_CHUNK_SIZE]
+        changes = values(
+            column('user_id', table.c.user_id.type),
+            column('flashcard_id', table.c.flashcard_id.type),
+            *(column(name, table.c[name].type) for name in SCHEDULE_COLUMNS),
+            name='changes'
+        ).data([
+            (state['user_id'], state['flashcard_id'], *(state[name] for name in SCHEDULE_COLUMNS))
+            for state in chunk
+        ])
+        db.session.execute(
+            update(table).where(
+                # VALUES literals arrive untyped, so the ids need an explicit cast
+                table.c.user_id == cast(changes.c.user_id, table.c.user_id.type),
+                table.c.flashcard_id == cast(changes.c.flashcard_id, table.c.flashcard_id.type)
+            ).values({name: changes.c[name] for name in SCHEDULE_COLUMNS})
+        )
+
+def apply_review_events(events):
+    """Record a batch of review events and reschedule their cards in one transaction.
+
+    One locking SELECT, one multi-row INSERT (COPY for large batches) and one UPDATE ... FROM (VALUES ...)
+    per chunk, however many events there are. Events are applied in reviewed_at order. Events for cards
+    that were deleted, or that are not in the event's study set, are skipped.
+    """
+    started = time.perf_counter()
+    try:
+        states = _lock_review_states(sorted({(event['user_id'], event['flashcard_id']) for event in events}))
+
+        applied = []
+        rescheduled = {}
+        for event in sorted(events, key=lambda event: event['reviewed_at']):
+            key = (event['user_id'], event['flashcard_id'])
+            state = states.get(key)
+            if state is None or state['studyset_id'] != event['studyset_id']:
+                continue
+            state['repetitions'], state['interval_days'], state['ease_factor'], state['lapses'], state['due_at'] = next_review(
+                state['repetitions'], state['interval_days'], state['ease_factor'], state['lapses'],
+                event['grade'], event['reviewed_at']
+            )
+            state['reviews_count'] += 1
+            state['last_reviewed_at'] = event['reviewed_at']
+            rescheduled[key] = state
+            applied.append(event)
+
+        _insert_review_events(applied)
+        _update_review_states(list(rescheduled.values()))
+        db.session.commit()
+
+    except Exception as e:
+        db.session.rollback()
+        raise e
+
+    REVIEW_EVENTS.labels('applied').inc(len(applied))
+    REVIEW_EVENTS.labels('skipped').inc(len(events) - len(applied))
+    REVIEW_FLUSH_SECONDS.observe(time.perf_counter() - started)
+    return {'applied': len(applied), 'skipped': len(events) - len(applied), 'states': rescheduled}
+
+def record_review(studyset_id, user_id, flashcard_id, grade, now=None):
+    """Grade one card right away; returns its new review state, or None if the card isn't in the set"""
+    event = _review_event(studyset_id, user_id, flashcard_id, grade, now or datetime.now())
+    state = apply_review_events([event])['states'].get((event['user_id'], event['flashcard_id']))
+    return ReviewState.row_to_dict(SimpleNamespace(**state)) if state else None
+
+class ReviewBuffer:
+    """Write-behind queue of review events for one worker process.
+
+    A daemon thread flushes every `interval` seconds, or as soon as `flush_size` events are waiting,
+    and once more at interpreter exit. Events still buffered when a worker is killed are lost.
+    """
+
+    def __init__(self, app, interval, flush_size):
+        self.app = app
+        self.interval = interval
+        self.flush_size = flush_size
+        self._events = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stats = {'flushes': 0, 'failed_flushes': 0, 'applied': 0, 'skipped': 0, 'dropped': 0}
+        self._thread = threading.Thread(target=self._run, name='review-flush', daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def add(self, events):
+        with self._lock:
+            self._events.extend(events)
+            pending = len(self._events)
+        if pending >= self.flush_size:
+            self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """Apply everything buffered so far; returns the number of events written or skipped"""
+        with self._flush_lock:
+            with self._lock:
+                events, self._events = self._events, []
+            if not events:
+                return 0
+
+            with self.app.app_context():
+                try:
+                    result = apply_review_events(events)
+                except OperationalError as e:
+                    self._requeue(events, e)
+                    return 0
+                except Exception as e:
+                    self._drop(events, e)
+                    return 0
+                finally:
+                    db.session.remove()
+
+            with self._lock:
+                self._stats['flushes'] += 1
+                self._stats['applied'] += result['applied']
+                self._stats['skipped'] += result['skipped']
+            return len(events)
+
+    def _requeue(self, events, error):
+        # The database is unreachable, not the batch bad: keep it for the next flush while there is room
+        with self._lock:
+            self._stats['failed_flushes'] += 1
+            if len(self._events) + len(events) > MAX_BUFFERED_FLUSHES * self.flush_size:
+                requeued = False
+            else:
+                self._events[:0] = events
+                requeued = True
+        if requeued:
+            self.app.logger.error(f"❌ Review flush failed, keeping {len(events)} events for retry: {str(error)}")
+        else:
+            self._drop(events, error)
+
+    def _drop(self, events, error):
+        with self._lock:
+            self._stats['dropped'] += len(events)
+        REVIEW_EVENTS.labels('dropped').inc(len(events))
+        self.app.logger.error(f"❌ Review flush failed, dropped {len(events)} events: {str(error)}")
+
+    def stats(self):
+        with self._lock:
+            return {**self._stats, 'pending': len(self._events), 'interval': self.interval, 'flush_size': self.flush_size}
+
+def _get_review_buffer():
+    """Per-process buffer, rebuilt after a fork so each gunicorn worker runs its own flush thread"""
+    global _buffer, _buffer_pid
+    with _buffer_lock:
+        if _buffer is None or _buffer_pid != os.getpid():
+            _buffer = ReviewBuffer(
+                current_app._get_current_object(),
+                interval=current_app.config['REVIEW_FLUSH_INTERVAL'],
+                flush_size=current_app.config['REVIEW_FLUSH_SIZE']
+            )
+            _buffer_pid = os.getpid()
+    return _buffer
+
+def submit_review_events(events):
+    """Queue events for the next bulk flush, or apply them now when REVIEW_FLUSH_INTERVAL is 0"""
+    if current_app.config['REVIEW_FLUSH_INTERVAL'] <= 0:
+        result = apply_review_events(events)
+        return {'buffered': False, 'accepted': len(events), 'applied': result['applied'], 'skipped': result['skipped']}
+
+    _get_review_buffer().add(events)
+    return {'buffered': True, 'accepted': len(events)}
+
+def get_review_buffer_stats():
+    if _buffer is None or _buffer_pid != os.getpid():
+        return {'pending': 0}
+    return _buffer.stats()
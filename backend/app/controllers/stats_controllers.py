@@ -0,0 +1,49 @@
+from datetime import datetime
+from sqlalchemy import Integer, func, update
+from sqlalchemy.dialects.postgresql import array, insert
+from app.models.user_stats_model import UserStats
+from app import db
+
+EMPTY_STATS = {'total_flashcards': 0, 'ai_generated': 0, 'manual_cards': 0, 'cards_per_set': {}}
+
+def get_user_stats(user_id):
+    """Flashcard totals for a user: a single primary-key lookup"""
+    stats = db.session.get(UserStats, user_id)
+    return stats.to_dict() if stats else dict(EMPTY_STATS, cards_per_set={})
+
+def adjust_user_stats(user_id, studyset_id, cards=0, ai_cards=0):
+    """Add signed deltas to a user's counters and the set's count, creating either if missing.
+
+    One upsert on the user's row. Does not commit; call it inside the write's own transaction.
+    """
+    table = UserStats.__table__
+    key = str(studyset_id)
+    statement = insert(table).values(
+        user_id=user_id,
+        total_flashcards=cards,
+        ai_flashcards=ai_cards,
+        cards_per_set={key: cards},
+        updated_at=datetime.now()
+    )
+    set_count = func.coalesce(table.c.cards_per_set[key].astext.cast(Integer), 0) + cards
+    db.session.execute(statement.on_conflict_do_update(
+        index_elements=[table.c.user_id],
+        set_={
+            'total_flashcards': table.c.total_flashcards + statement.excluded.total_flashcards,
+            'ai_flashcards': table.c.ai_flashcards + statement.excluded.ai_flashcards,
+            'cards_per_set': func.jsonb_set(table.c.cards_per_set, array([key]), func.to_jsonb(set_count)),
+            'updated_at': statement.excluded.updated_at,
+        }
+    ))
+
+def remove_studyset_stats(user_id, studyset_id, cards, ai_cards):
+    """Take a deleted set's cards off the user's counters and drop its entry. Does not commit"""
+    table = UserStats.__table__
+    db.session.execute(
+        update(table).where(table.c.user_id == user_id).values(
+            total_flashcards=table.c.total_flashcards - cards,
+            ai_flashcards=table.c.ai_flashcards - ai_cards,
+            cards_per_set=table.c.cards_per_set.delete_path(array([str(studyset_id)])),
+            updated_at=datetime.now()
+        )
+    )
@@ -1,23 +1,108 @@
+import threading
+from flask import current_app
+from sqlalchemy import String, cast, func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from app.models import StudySet, Flashcard
 from app import db
+from app.controllers.response_cache_controllers import invalidate_cached_responses
+from app.controllers.stats_controllers import adjust_user_stats, remove_studyset_stats
+from utils.lru_cache import LRUCache
+from utils.pagination import encode_cursor, decode_cursor
 
-def get_all_studysets(user_id):
-    """Get all study sets for a user with flashcard counts"""
+_owner_cache = None
+_owner_cache_lock = threading.Lock()
+
+def _get_owner_cache():
+    global _owner_cache
+    if _owner_cache is None:
+        with _owner_cache_lock:
+            if _owner_cache is None:
+                _owner_cache = LRUCache(
+                    maxsize=current_app.config['STUDYSET_OWNER_CACHE_SIZE'],
+                    ttl=current_app.config['STUDYSET_OWNER_CACHE_TTL'],
+                    name='studyset_owners'
+                )
+    return _owner_cache
+
+def get_all_studysets(user_id, limit=None, after=None):
+    """Get a page of study sets for a user with flashcard counts in one query"""
     try:
-        studysets = StudySet.query.filter_by(user_id=user_id).all()
+        query = db.session.query(
+            StudySet,
+            func.count(Flashcard.id).label('flashcard_count')
+        ).outerjoin(
+            Flashcard, Flashcard.studyset_id == StudySet.id
+        ).filter(
+            StudySet.user_id == user_id
+        ).group_by(StudySet.id)
+
+        # Keyset pagination over (updated_at, id), newest first
+        if after:
+            after_updated_at, after_id = decode_cursor(after)
+            query = query.filter(
+                tuple_(StudySet.updated_at, StudySet.id) < tuple_(after_updated_at, after_id)
+            )
+
+        query = query.order_by(StudySet.updated_at.desc(), StudySet.id.desc())
+        if limit:
+            # Fetch one extra row to know whether another page exists
+            query = query.limit(limit + 1)
+
+        rows = query.all()
+        next_cursor = None
+        if limit and len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1][0]
+            next_cursor = encode_cursor(last.updated_at, last.id)
+
         result = []
-        
-        for studyset in studysets:
+        for studyset, flashcard_count in rows:
             studyset_dict = studyset.to_dict()
-            # Add flashcard count
-            flashcard_count = Flashcard.query.filter_by(studyset_id=studyset.id).count()
             studyset_dict['flashcard_count'] = flashcard_count
             result.append(studyset_dict)
-            
-        return result
+
+        return result, next_cursor
     except Exception as e:
         raise e
 
+def get_studyset_owner(studyset_id):
+    """Owner id of a study set as a string, or None; reads only user_id and caches it briefly"""
+    owner_cache = _get_owner_cache()
+    key = str(studyset_id)
+    owner = owner_cache.get(key)
+    if owner is not None:
+        return owner
+
+    user_id = db.session.execute(
+        select(StudySet.user_id).where(StudySet.id == studyset_id)
+    ).scalar()
+    if user_id is None:
+        return None
+    # Owners never change, so the TTL only bounds how long other workers miss a delete
+    owner = str(user_id)
+    owner_cache.set(key, owner)
+    return owner
+
+def get_studyset_version(studyset_id):
+    """Version stamp of one study set, or None if it does not exist"""
+    return db.session.execute(
+        select(StudySet.version).where(StudySet.id == studyset_id)
+    ).scalar()
+
+def get_studysets_version(user_id):
+    """Digest of (id, version) over all of a user's study sets; changes with any create, edit or delete"""
+    stamp = cast(StudySet.id, String) + ':' + cast(StudySet.version, String)
+    return db.session.execute(
+        select(func.md5(func.coalesce(func.string_agg(stamp, aggregate_order_by(',', StudySet.id)), '')))
+        .where(StudySet.user_id == user_id)
+    ).scalar()
+
+def bump_studyset_version(studyset_id):
+    """Mark a study set as changed inside the caller's transaction"""
+    db.session.execute(
+        update(StudySet).where(StudySet.id == studyset_id).values(version=StudySet.version + 1)
+    )
+
 def create_studyset(user_id, data):
     try:
         studyset = StudySet(
@@ -26,7 +111,11 @@ def create_studyset(user_id, data):
             description=data.get('description', '')
         )
         db.session.add(studyset)
+        db.session.flush()
+        # An empty set still shows up in the per-set counts
+        adjust_user_stats(user_id, studyset.id)
         db.session.commit()
+        invalidate_cached_responses(user_id=user_id)
         return studyset.to_dict()
     except Exception as e:
         db.session.rollback()
@@ -44,7 +133,9 @@ def update_studyset(studyset_id, data):
         
         studyset.title = data.get('title', studyset.title)
         studyset.description = data.get('description', studyset.description)
+        studyset.version = StudySet.version + 1
         db.session.commit()
+        invalidate_cached_responses(studyset_id, studyset.user_id)
         return studyset.to_dict()
     except Exception as e:
         db.session.rollback()
@@ -56,8 +147,16 @@ def delete_studyset(studyset_id):
         if not studyset:
             return False
         
+        user_id = studyset.user_id
+        counts = db.session.query(
+            func.count(Flashcard.id).label('cards'),
+            func.count(Flashcard.id).filter(Flashcard.is_ai_generated).label('ai_cards')
+        ).filter(Flashcard.studyset_id == studyset_id).one()
         db.session.delete(studyset)
+        remove_studyset_stats(user_id, studyset_id, counts.cards, counts.ai_cards)
         db.session.commit()
+        _get_owner_cache().delete(str(studyset_id))
+        invalidate_cached_responses(studyset_id, user_id)
         return True
     except Exception as e:
         db.session.rollback()
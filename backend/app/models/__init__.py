@@ -1,3 +1,8 @@
 from .user_model import User
 from .studyset_model import StudySet
-from .flashcard_model import Flashcard
\ No newline at end of file
+from .flashcard_model import Flashcard
+from .generation_cache_model import GenerationCacheEntry
+from .generation_job_model import GenerationJob
+from .review_state_model import ReviewState
+from .review_event_model import ReviewEvent
+from .user_stats_model import UserStats
\ No newline at end of file
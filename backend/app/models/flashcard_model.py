@@ -1,16 +1,32 @@
 import uuid
 from datetime import datetime
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from .. import db
 
+# Questions outrank answers; Postgres keeps the column in sync on every write
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(question, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(answer, '')), 'B')"
+)
+
 class Flashcard(db.Model):
     __tablename__ = 'flashcards'
+    __table_args__ = (
+        # Serves keyset pagination and streaming in get_flashcards_by_studyset
+        db.Index('ix_flashcards_studyset_id_created_at_id', 'studyset_id', 'created_at', 'id'),
+        db.Index('ix_flashcards_user_id', 'user_id'),
+        db.Index('ix_flashcards_user_id_search_vector', 'user_id', 'search_vector', postgresql_using='gin'),
+    )
 
     id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = db.Column(UUID(as_uuid=True), db.ForeignKey('users.id'), nullable=False)
     studyset_id = db.Column(UUID(as_uuid=True), db.ForeignKey('studysets.id'), nullable=False)
     question = db.Column(db.Text, nullable=False)
     answer = db.Column(db.Text, nullable=False)
+    is_ai_generated = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
+    # Deferred: only the duplicate index and search read these, never to_dict
+    minhash = db.deferred(db.Column(db.LargeBinary, nullable=True))  # Near-duplicate signature of the question
+    search_vector = db.deferred(db.Column(TSVECTOR, db.Computed(SEARCH_VECTOR_SQL, persisted=True)))
     created_at = db.Column(db.DateTime, default=datetime.now)
     updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
     
@@ -21,11 +37,19 @@ class Flashcard(db.Model):
         return f"<Flashcard {self.id}: {self.question[:50]}...>"
     
     def to_dict(self):
+        return Flashcard.row_to_dict(self)
+
+    # Columns row_to_dict needs; write paths RETURN only these
+    SERIALIZED_COLUMNS = ('id', 'user_id', 'question', 'answer', 'created_at', 'updated_at')
+
+    @staticmethod
+    def row_to_dict(row):
+        """Serialize anything exposing flashcard columns as attributes (model or Core row)"""
         return {
-            'id': str(self.id),
-            'user_id': str(self.user_id),
-            'question': self.question,
-            'answer': self.answer,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat(),
+            'id': str(row.id),
+            'user_id': str(row.user_id),
+            'question': row.question,
+            'answer': row.answer,
+            'created_at': row.created_at.isoformat(),
+            'updated_at': row.updated_at.isoformat(),
         }
\ No newline at end of file
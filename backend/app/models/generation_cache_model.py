@@ -0,0 +1,15 @@
+from datetime import datetime
+from .. import db
+
+class GenerationCacheEntry(db.Model):
+    __tablename__ = 'generation_cache'
+
+    # sha256 of the extracted text plus prompt template and generation config
+    key = db.Column(db.String(64), primary_key=True)
+    flashcards = db.Column(db.JSON, nullable=False)
+    flashcards_count = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.now)
+    last_accessed_at = db.Column(db.DateTime, default=datetime.now, index=True)
+
+    def __repr__(self):
+        return f"<GenerationCacheEntry {self.key[:12]}: {self.flashcards_count} flashcards>"
@@ -0,0 +1,39 @@
+import uuid
+from datetime import datetime
+from sqlalchemy.dialects.postgresql import UUID
+from .. import db
+
+class GenerationJob(db.Model):
+    __tablename__ = 'generation_jobs'
+
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = db.Column(UUID(as_uuid=True), db.ForeignKey('users.id'), nullable=False, index=True)
+    studyset_id = db.Column(UUID(as_uuid=True), db.ForeignKey('studysets.id', ondelete='CASCADE'), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, succeeded, failed
+    source_file = db.Column(db.String(255), nullable=True)
+    result = db.Column(db.JSON, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.now)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
+
+    def __repr__(self):
+        return f"<GenerationJob {self.id}: {self.status}>"
+
+    def is_finished(self):
+        """Check if the job has reached a terminal state"""
+        return self.status in ('succeeded', 'failed')
+
+    def to_dict(self):
+        return {
+            'id': str(self.id),
+            'studyset_id': str(self.studyset_id),
+            'status': self.status,
+            'source_file': self.source_file,
+            'result': self.result,
+            'error': self.error,
+            'created_at': self.created_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
@@ -0,0 +1,21 @@
+import uuid
+from datetime import datetime
+from sqlalchemy.dialects.postgresql import UUID
+from .. import db
+
+class ReviewEvent(db.Model):
+    """One graded card flip; append-only, written in bulk by the review buffer"""
+    __tablename__ = 'review_events'
+    __table_args__ = (
+        db.Index('ix_review_events_user_id_reviewed_at', 'user_id', 'reviewed_at'),
+    )
+
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = db.Column(UUID(as_uuid=True), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    flashcard_id = db.Column(UUID(as_uuid=True), db.ForeignKey('flashcards.id', ondelete='CASCADE'), nullable=False)
+    studyset_id = db.Column(UUID(as_uuid=True), db.ForeignKey('studysets.id', ondelete='CASCADE'), nullable=False)
+    grade = db.Column(db.SmallInteger, nullable=False)  # SM-2 quality, 0-5
+    reviewed_at = db.Column(db.DateTime, nullable=False, default=datetime.now)
+
+    def __repr__(self):
+        return f"<ReviewEvent {self.flashcard_id} grade {self.grade}>"
@@ -0,0 +1,44 @@
+from datetime import datetime
+from sqlalchemy.dialects.postgresql import UUID
+from .. import db
+
+class ReviewState(db.Model):
+    """SM-2 scheduling state of one card for one user; created alongside the card, due immediately"""
+    __tablename__ = 'review_states'
+    __table_args__ = (
+        # Due-card queues are index range scans: across all sets, or within one set
+        db.Index('ix_review_states_user_id_due_at', 'user_id', 'due_at'),
+        db.Index('ix_review_states_user_id_studyset_id_due_at', 'user_id', 'studyset_id', 'due_at'),
+    )
+
+    user_id = db.Column(UUID(as_uuid=True), db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    flashcard_id = db.Column(UUID(as_uuid=True), db.ForeignKey('flashcards.id', ondelete='CASCADE'), primary_key=True)
+    studyset_id = db.Column(UUID(as_uuid=True), db.ForeignKey('studysets.id', ondelete='CASCADE'), nullable=False)
+    repetitions = db.Column(db.Integer, nullable=False, default=0)
+    interval_days = db.Column(db.Float, nullable=False, default=0.0)
+    ease_factor = db.Column(db.Float, nullable=False, default=2.5)
+    lapses = db.Column(db.Integer, nullable=False, default=0)
+    reviews_count = db.Column(db.Integer, nullable=False, default=0)
+    due_at = db.Column(db.DateTime, nullable=False, default=datetime.now)
+    last_reviewed_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<ReviewState {self.flashcard_id} due {self.due_at}>"
+
+    def to_dict(self):
+        return ReviewState.row_to_dict(self)
+
+    # Columns row_to_dict needs; due-card queries select only these
+    SERIALIZED_COLUMNS = ('repetitions', 'interval_days', 'ease_factor', 'lapses', 'reviews_count', 'due_at', 'last_reviewed_at')
+
+    @staticmethod
+    def row_to_dict(row):
+        return {
+            'repetitions': row.repetitions,
+            'interval_days': row.interval_days,
+            'ease_factor': round(row.ease_factor, 4),
+            'lapses': row.lapses,
+            'reviews_count': row.reviews_count,
+            'due_at': row.due_at.isoformat(),
+            'last_reviewed_at': row.last_reviewed_at.isoformat() if row.last_reviewed_at else None,
+        }
@@ -5,6 +5,10 @@ from .. import db
 
 class StudySet(db.Model):
     __tablename__ = 'studysets'
+    __table_args__ = (
+        # Serves the keyset-paginated listing in get_all_studysets
+        db.Index('ix_studysets_user_id_updated_at_id', 'user_id', 'updated_at', 'id'),
+    )
 
     id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = db.Column(UUID(as_uuid=True), db.ForeignKey('users.id'), nullable=False)
@@ -12,6 +16,8 @@ class StudySet(db.Model):
     description = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.now)
     updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
+    # Bumped by every write to the set or its flashcards; feeds the ETags on GET responses
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
 
     # Relationships
     # User → StudySets (one-to-many)
@@ -52,15 +52,6 @@ class User(db.Model):
         return check_password_hash(self.password_hash, password)
     
     def get_flashcard_stats(self):
-        """Get user's flashcard statistics"""
-        from .flashcard_model import Flashcard
-        
-        total_cards = Flashcard.query.filter_by(user_id=self.id).count()
-        ai_generated = Flashcard.query.filter_by(user_id=self.id, is_ai_generated=True).count()
-        manual_cards = total_cards - ai_generated
-        
-        return {
-            'total_flashcards': total_cards,
-            'ai_generated': ai_generated,
-            'manual_cards': manual_cards
-        }
\ No newline at end of file
+        """Get user's flashcard statistics from the denormalized user_stats row"""
+        from app.controllers.stats_controllers import get_user_stats
+        return get_user_stats(self.id)
\ No newline at end of file
@@ -0,0 +1,24 @@
+from datetime import datetime
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from .. import db
+
+class UserStats(db.Model):
+    """Per-user flashcard counters, kept current by the write controllers so reads are one key lookup"""
+    __tablename__ = 'user_stats'
+
+    user_id = db.Column(UUID(as_uuid=True), db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    total_flashcards = db.Column(db.Integer, nullable=False, default=0)
+    ai_flashcards = db.Column(db.Integer, nullable=False, default=0)
+    cards_per_set = db.Column(JSONB, nullable=False, default=dict)  # {studyset_id: card count}
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
+
+    def __repr__(self):
+        return f"<UserStats {self.user_id}: {self.total_flashcards} cards>"
+
+    def to_dict(self):
+        return {
+            'total_flashcards': self.total_flashcards,
+            'ai_generated': self.ai_flashcards,
+            'manual_cards': self.total_flashcards - self.ai_flashcards,
+            'cards_per_set': self.cards_per_set,
+        }
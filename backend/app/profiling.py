@@ -0,0 +1,96 @@
+import re
+import time
+from collections import Counter
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from utils.metrics import HTTP_REQUEST_SECONDS
+
+# Bound parameters, then runs of them, collapse so `IN (...)` lists of any length share a shape
+PLACEHOLDER = re.compile(r'%\(\w+\)s|%s|\?')
+PLACEHOLDER_RUN = re.compile(r'\?(?:\s*,\s*\?)+')
+WHITESPACE = re.compile(r'\s+')
+
+def statement_shape(statement):
+    """A statement with its literals and parameter lists normalized away"""
+    shape = PLACEHOLDER.sub('?', statement)
+    shape = PLACEHOLDER_RUN.sub('?', shape)
+    return WHITESPACE.sub(' ', shape).strip()
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context, not the connection, so a statement that raises leaves nothing behind
+    if context is not None and has_request_context() and 'query_stats' in g:
+        context._profiling_started = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, '_profiling_started', None)
+    if started is None or not has_request_context() or 'query_stats' not in g:
+        return
+    stats = g.query_stats
+    stats['count'] += 1
+    stats['seconds'] += time.perf_counter() - started
+    if stats['shapes'] is not None:
+        stats['shapes'][statement_shape(statement)] += 1
+
+def init_request_profiling(app):
+    """Count queries and database time per request; report them in Server-Timing and the logs"""
+    if not app.config['QUERY_PROFILING']:
+        return
+
+    # Listening on the Engine class covers engines Flask-SQLAlchemy creates later
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+    @app.before_request
+    def start_request_profile():
+        g.request_started = time.perf_counter()
+        # Normalizing every statement is only worth it when the N+1 check will read the shapes
+        shapes = Counter() if app.config['N_PLUS_ONE_THRESHOLD'] else None
+        g.query_stats = {'count': 0, 'seconds': 0.0, 'shapes': shapes}
+
+    @app.after_request
+    def finish_request_profile(response):
+        if 'query_stats' not in g:
+            return response
+        stats = g.query_stats
+        total_ms = (time.perf_counter() - g.request_started) * 1000
+        db_ms = stats['seconds'] * 1000
+
+        response.headers.add(
+            'Server-Timing',
+            f'db;desc="{stats["count"]} queries";dur={db_ms:.1f}, app;dur={total_ms:.1f}'
+        )
+
+        if total_ms >= app.config['SLOW_REQUEST_MS']:
+            app.logger.warning(
+                f"🐢 Slow request {request.method} {request.path} -> {response.status_code}: "
+                f"{total_ms:.0f} ms, {stats['count']} queries, {db_ms:.0f} ms in the database"
+            )
+
+        threshold = app.config['N_PLUS_ONE_THRESHOLD']
+        if threshold and stats['shapes'] is not None:
+            for shape, count in stats['shapes'].most_common():
+                if count < threshold:
+                    break
+                app.logger.warning(
+                    f"🔁 Possible N+1 in {request.endpoint}: statement ran {count}x in one request: {shape[:300]}"
+                )
+        return response
+
+def init_request_metrics(app):
+    """Observe every request in the flashly_http_request_duration_seconds histogram"""
+
+    @app.before_request
+    def start_request_timer():
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def observe_request(response):
+        if 'metrics_started' in g:
+            # The route template, not the path, so ids don't explode label cardinality
+            endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+            HTTP_REQUEST_SECONDS.labels(endpoint, request.method, str(response.status_code)).observe(
+                time.perf_counter() - g.metrics_started
+            )
+        return response
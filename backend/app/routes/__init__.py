@@ -1,8 +1,16 @@
 from .auth_routes import auth_bp
 from .studyset_routes import studyset_bp
 from .oauth_routes import oauth_bp
+from .flashcard_routes import flashcard_bp
+from .internal_routes import internal_bp
+from .job_routes import job_bp
+from .metrics_routes import metrics_bp
 
 def register_routes(app):
     app.register_blueprint(auth_bp)
     app.register_blueprint(studyset_bp)
-    app.register_blueprint(oauth_bp)
\ No newline at end of file
+    app.register_blueprint(oauth_bp)
+    app.register_blueprint(flashcard_bp)
+    app.register_blueprint(internal_bp)
+    app.register_blueprint(job_bp)
+    app.register_blueprint(metrics_bp)
\ No newline at end of file
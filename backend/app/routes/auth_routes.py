@@ -3,6 +3,7 @@ from flask_jwt_extended import jwt_required, get_jwt_identity, unset_jwt_cookies
 from datetime import datetime  # ✅ Add this import for the test_cookie route
 from app.models import User
 from app.controllers.auth_controllers import login_user, register_user, get_profile_user
+from app.controllers.stats_controllers import get_user_stats
 
 auth_bp = Blueprint("auth", __name__, url_prefix="/auth")
 
@@ -87,6 +88,12 @@ def profile():
         current_app.logger.error(f"Profile error: {str(e)}")
         return jsonify({'error': 'Failed to get profile'}), 500
 
+@auth_bp.route("/stats", methods=["GET"])
+@jwt_required()
+def stats():
+    """Flashcard totals, AI vs manual, and cards per study set for the current user"""
+    return jsonify(get_user_stats(get_jwt_identity()))
+
 @auth_bp.route('/test-cookie', methods=['GET'])
 def test_cookie():
     """Test endpoint to verify cookie settings"""
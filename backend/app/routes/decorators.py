@@ -0,0 +1,39 @@
+import hmac
+from functools import wraps
+from flask import current_app, jsonify, request
+from flask_jwt_extended import get_jwt_identity
+from app.controllers.studyset_controllers import get_studyset_owner
+
+def studyset_owner_required(view):
+    """404 unless the study set in the URL exists, 403 unless the current user owns it.
+
+    Goes below @jwt_required(). Reads the `studyset_id` URL parameter.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        owner = get_studyset_owner(kwargs['studyset_id'])
+        if owner is None:
+            return jsonify({"error": "Study set not found"}), 404
+        if owner != str(get_jwt_identity()):
+            return jsonify({"error": "Unauthorized"}), 403
+        return view(*args, **kwargs)
+    return wrapper
+
+def operator_token_required(config_key):
+    """Gate an operator endpoint behind a shared bearer token read from config[config_key].
+
+    With no token configured the endpoint is only served in debug (development) builds and 404s
+    everywhere else, so a missing setting never exposes it.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            token = current_app.config.get(config_key)
+            if not token:
+                if not current_app.debug:
+                    return jsonify({"error": "Not found"}), 404
+            elif not hmac.compare_digest(request.headers.get('Authorization', ''), f"Bearer {token}"):
+                return jsonify({"error": "Unauthorized"}), 401
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
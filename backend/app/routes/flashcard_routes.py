@@ -0,0 +1,21 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.controllers.flashcard_controllers import search_flashcards
+from utils.pagination import DEFAULT_PAGE_SIZE, parse_limit
+
+flashcard_bp = Blueprint("flashcards", __name__, url_prefix="/flashcards")
+
+@flashcard_bp.route("/search", methods=["GET"])
+@jwt_required()
+def search_user_flashcards():
+    """Ranked search across every study set the user owns: ?q=&limit=&after="""
+    user_id = get_jwt_identity()
+    query_text = request.args.get('q', '').strip()
+    if not query_text:
+        return jsonify({"error": "Search query is required"}), 400
+
+    try:
+        limit = parse_limit(request.args.get('limit'), default=DEFAULT_PAGE_SIZE)
+        return jsonify(search_flashcards(user_id, query_text, limit, after=request.args.get('after')))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
@@ -0,0 +1,44 @@
+from flask import Blueprint, jsonify
+from app import db
+from app.routes.decorators import operator_token_required
+from app.controllers.generation_cache_controllers import get_generation_cache_stats
+from app.controllers.response_cache_controllers import get_response_cache_stats
+from app.controllers.review_controllers import get_review_buffer_stats
+from utils.db_pool import pool_stats
+from utils.gemini_client import get_rate_limiter
+
+internal_bp = Blueprint("internal", __name__, url_prefix="/internal")
+
+@internal_bp.route("/generation-cache", methods=["GET"])
+@operator_token_required('INTERNAL_TOKEN')
+def generation_cache_stats():
+    """Hit/miss counts for the AI generation cache in this worker"""
+    return jsonify(get_generation_cache_stats())
+
+
+@internal_bp.route("/response-cache", methods=["GET"])
+@operator_token_required('INTERNAL_TOKEN')
+def response_cache_stats():
+    """Hit/miss counts for cached study set GET bodies in this worker"""
+    return jsonify(get_response_cache_stats())
+
+
+@internal_bp.route("/gemini", methods=["GET"])
+@operator_token_required('INTERNAL_TOKEN')
+def gemini_limiter_stats():
+    """Rate limiter wait times and bucket levels for Gemini calls in this worker"""
+    return jsonify(get_rate_limiter().stats())
+
+
+@internal_bp.route("/db-pool", methods=["GET"])
+@operator_token_required('INTERNAL_TOKEN')
+def db_pool_stats():
+    """Connection pool occupancy and checkout times in this worker"""
+    return jsonify(pool_stats(db.engine.pool))
+
+
+@internal_bp.route("/review-buffer", methods=["GET"])
+@operator_token_required('INTERNAL_TOKEN')
+def review_buffer_stats():
+    """Pending and flushed review events in this worker's write-behind buffer"""
+    return jsonify(get_review_buffer_stats())
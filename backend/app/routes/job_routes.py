@@ -0,0 +1,15 @@
+from flask import Blueprint, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.controllers.job_controllers import get_job
+
+job_bp = Blueprint("jobs", __name__, url_prefix="/jobs")
+
+@job_bp.route("/<uuid:job_id>", methods=["GET"])
+@jwt_required()
+def get_job_status(job_id):
+    """Poll a background job; result is filled in once status is 'succeeded'"""
+    user_id = get_jwt_identity()
+    job = get_job(job_id, user_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job)
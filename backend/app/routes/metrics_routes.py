@@ -0,0 +1,12 @@
+from flask import Blueprint, Response
+from app.routes.decorators import operator_token_required
+from utils.metrics import render_metrics
+
+metrics_bp = Blueprint("metrics", __name__)
+
+@metrics_bp.route("/metrics", methods=["GET"])
+@operator_token_required('METRICS_TOKEN')
+def metrics():
+    """Prometheus exposition, summed over every gunicorn worker"""
+    body, content_type = render_metrics()
+    return Response(body, content_type=content_type)
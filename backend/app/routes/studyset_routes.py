@@ -1,7 +1,13 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.controllers.studyset_controllers import get_all_studysets, create_studyset, get_studyset_by_id, update_studyset, delete_studyset
-from app.controllers.flashcard_controllers import get_flashcards_by_studyset, update_flashcards, create_flashcards, preview_flashcards_from_file, save_preview_flashcards
+from app.controllers.studyset_controllers import get_all_studysets, create_studyset, get_studyset_by_id, get_studyset_version, get_studysets_version, update_studyset, delete_studyset
+from app.controllers.flashcard_controllers import EXPORT_FORMATS, get_flashcards_by_studyset, stream_studyset_json, update_flashcards, create_flashcards, preview_flashcards_from_file, prepare_preview_stream, save_preview_flashcards, stream_flashcards_export, import_flashcards
+from app.controllers.job_controllers import enqueue_preview_job, enqueue_signature_backfill
+from app.controllers.review_controllers import find_unknown_flashcards, get_due_flashcards, parse_review_events, record_review, submit_review_events
+from app.controllers.response_cache_controllers import cached_json_response, make_etag, not_modified, studyset_scope, studysets_scope
+from app.routes.decorators import studyset_owner_required
+from utils.pagination import DEFAULT_PAGE_SIZE, parse_limit
+from utils.scheduler import parse_grade
 
 studyset_bp = Blueprint("studyset", __name__, url_prefix="/studysets")
 
@@ -9,8 +15,22 @@ studyset_bp = Blueprint("studyset", __name__, url_prefix="/studysets")
 @jwt_required()
 def get_user_studysets():
     user_id = get_jwt_identity()
-    studysets = get_all_studysets(user_id)
-    return jsonify(studysets)
+    etag = make_etag('studysets', user_id, get_studysets_version(user_id), request.query_string.decode())
+
+    def build():
+        try:
+            limit = parse_limit(request.args.get('limit'))
+            studysets, next_cursor = get_all_studysets(user_id, limit=limit, after=request.args.get('after'))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        # Body stays a plain list; the cursor for the next page travels in a header
+        response = jsonify(studysets)
+        if next_cursor:
+            response.headers['X-Next-Cursor'] = next_cursor
+        return response
+
+    return cached_json_response(studysets_scope(user_id), etag, build)
 
 @studyset_bp.route("/", methods=["POST"])
 @jwt_required()
@@ -20,46 +40,67 @@ def post_studyset():
     studyset = create_studyset(user_id, data)
     return jsonify(studyset), 201
 
-@studyset_bp.route("/<uuid:id>", methods=["PUT"])
+@studyset_bp.route("/<uuid:studyset_id>", methods=["PUT"])
 @jwt_required()
-def put_studyset(id):
+@studyset_owner_required
+def put_studyset(studyset_id):
     data = request.get_json()
-    studyset = update_studyset(id, data)
+    studyset = update_studyset(studyset_id, data)
     if studyset is None:
         return jsonify({"error": "Study set not found"}), 404
     
     return jsonify(studyset)
 
-@studyset_bp.route("/<uuid:id>", methods=["DELETE"])
+@studyset_bp.route("/<uuid:studyset_id>", methods=["DELETE"])
 @jwt_required()
-def remove_studyset(id):
-    success = delete_studyset(id)
+@studyset_owner_required
+def remove_studyset(studyset_id):
+    success = delete_studyset(studyset_id)
     if not success:
         return jsonify({"error": "Study set not found"}), 404
-    return jsonify({"message": f"Study set {id} deleted successfully"})
+    return jsonify({"message": f"Study set {studyset_id} deleted successfully"})
 
 @studyset_bp.route("/<uuid:studyset_id>", methods=["GET"])
 @jwt_required()
+@studyset_owner_required
 def get_studyset_flashcards(studyset_id):
-    studyset = get_studyset_by_id(studyset_id)
-    if not studyset:
+    version = get_studyset_version(studyset_id)
+    if version is None:
         return jsonify({"error": "Study set not found"}), 404
-    
-    flashcards = get_flashcards_by_studyset(studyset_id)
-    
-    return jsonify({
-        "studyset": studyset,
-        "flashcards": flashcards
-    })
+    etag = make_etag('studyset', studyset_id, version, request.query_string.decode())
+
+    if request.args.get('stream') in ('1', 'true'):
+        # Streamed bodies are too large to keep, but an unchanged set still earns a 304
+        response = not_modified(etag)
+        if response is not None:
+            return response
+        studyset = get_studyset_by_id(studyset_id)
+        response = Response(
+            stream_with_context(stream_studyset_json(studyset, studyset_id)),
+            mimetype='application/json'
+        )
+        response.set_etag(etag)
+        return response
+
+    def build():
+        try:
+            limit = parse_limit(request.args.get('limit'))
+            flashcards, next_cursor = get_flashcards_by_studyset(studyset_id, limit=limit, after=request.args.get('after'))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        return jsonify({
+            "studyset": get_studyset_by_id(studyset_id),
+            "flashcards": flashcards,
+            "next_cursor": next_cursor
+        })
+
+    return cached_json_response(studyset_scope(studyset_id), etag, build)
 
 @studyset_bp.route("/<uuid:studyset_id>/flashcards", methods=["POST"])
 @jwt_required()
+@studyset_owner_required
 def post_studyset_flashcards(studyset_id):
-    # Check if studyset exists first
-    studyset = get_studyset_by_id(studyset_id)
-    if not studyset:
-        return jsonify({"error": "Study set not found"}), 404
-    
     data = request.get_json()
     user_id = get_jwt_identity()
     
@@ -83,15 +124,10 @@ def post_studyset_flashcards(studyset_id):
     
 @studyset_bp.route("/<uuid:studyset_id>/flashcards/preview", methods=["POST"])
 @jwt_required()
+@studyset_owner_required
 def post_studyset_flashcards_preview(studyset_id):
     """Step 1: Generate preview without saving"""
-    studyset = get_studyset_by_id(studyset_id)
-    if not studyset:
-        return jsonify({"error": "Study set not found"}), 404
-    
     user_id = get_jwt_identity()
-    if studyset['user_id'] != str(user_id):
-        return jsonify({"error": "Unauthorized"}), 403
     
     if 'file' not in request.files:
         return jsonify({"error": "No file uploaded"}), 400
@@ -101,23 +137,48 @@ def post_studyset_flashcards_preview(studyset_id):
         return jsonify({"error": "No file selected"}), 400
     
     try:
+        # ?async=1 queues the work and answers immediately; poll GET /jobs/<id> for the result
+        if request.args.get('async') in ('1', 'true'):
+            job = enqueue_preview_job(studyset_id, user_id, file)
+            return jsonify(job), 202
+
         result = preview_flashcards_from_file(studyset_id, user_id, file)
         return jsonify(result), 200
         
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@studyset_bp.route("/<uuid:studyset_id>/flashcards/preview/stream", methods=["POST"])
+@jwt_required()
+@studyset_owner_required
+def post_studyset_flashcards_preview_stream(studyset_id):
+    """Step 1 (streaming): emit each generated card as an SSE 'card' event, then 'done'"""
+    user_id = get_jwt_identity()
+    
+    if 'file' not in request.files:
+        return jsonify({"error": "No file uploaded"}), 400
+    
+    file = request.files['file']
+    if file.filename == '':
+        return jsonify({"error": "No file selected"}), 400
+    
+    try:
+        events = prepare_preview_stream(studyset_id, user_id, file)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return Response(
+        stream_with_context(events),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @studyset_bp.route("/<uuid:studyset_id>/flashcards/save-preview", methods=["POST"])
 @jwt_required()
+@studyset_owner_required
 def post_save_preview_flashcards(studyset_id):
     """Step 2: Save approved preview to database"""
-    studyset = get_studyset_by_id(studyset_id)
-    if not studyset:
-        return jsonify({"error": "Study set not found"}), 404
-    
     user_id = get_jwt_identity()
-    if studyset['user_id'] != str(user_id):
-        return jsonify({"error": "Unauthorized"}), 403
     
     data = request.get_json()
     flashcards_data = data.get('flashcards', [])
@@ -126,7 +187,10 @@ def post_save_preview_flashcards(studyset_id):
         return jsonify({"error": "No flashcards data to save"}), 400
     
     try:
-        result = save_preview_flashcards(studyset_id, user_id, flashcards_data)
+        result = save_preview_flashcards(
+            studyset_id, user_id, flashcards_data,
+            allow_duplicates=bool(data.get('allow_duplicates', True))
+        )
         
         # Update studyset metadata
         update_studyset(studyset_id, {
@@ -141,6 +205,7 @@ def post_save_preview_flashcards(studyset_id):
 
 @studyset_bp.route("/<uuid:studyset_id>/flashcards", methods=["PUT"])
 @jwt_required()
+@studyset_owner_required
 def update_studyset_flashcards(studyset_id):
     data = request.get_json()
     user_id = get_jwt_identity()
@@ -150,9 +215,104 @@ def update_studyset_flashcards(studyset_id):
     #     {"id": "uuid", "question": "...", "answer": "..."},  # update existing
     #     {"question": "...", "answer": "..."},               # create new (no id)
     #   ],
-    #   "delete_ids": ["uuid1", "uuid2"]                      # delete these
+    #   "delete_ids": ["uuid1", "uuid2"],                     # delete these
+    #   "return_all": false                                   # true: respond with the whole set
     # }
     
     result = update_flashcards(studyset_id, user_id, data)
     return jsonify(result)
 
+@studyset_bp.route("/<uuid:studyset_id>/due", methods=["GET"])
+@jwt_required()
+@studyset_owner_required
+def get_due_studyset_flashcards(studyset_id):
+    """Cards due for review now, most overdue first, each with its scheduling state"""
+    user_id = get_jwt_identity()
+    try:
+        limit = parse_limit(request.args.get('limit'), default=DEFAULT_PAGE_SIZE)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({"flashcards": get_due_flashcards(studyset_id, user_id, limit)})
+
+@studyset_bp.route("/<uuid:studyset_id>/flashcards/<uuid:flashcard_id>/review", methods=["POST"])
+@jwt_required()
+@studyset_owner_required
+def post_flashcard_review(studyset_id, flashcard_id):
+    """Record an answer (again/hard/good/easy or 0-5) and return the card's next due date"""
+    user_id = get_jwt_identity()
+    data = request.get_json(silent=True) or {}
+    try:
+        grade = parse_grade(data.get('grade'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    review = record_review(studyset_id, user_id, flashcard_id, grade)
+    if review is None:
+        return jsonify({"error": "Flashcard not found"}), 404
+    return jsonify({"flashcard_id": str(flashcard_id), "review": review})
+
+@studyset_bp.route("/<uuid:studyset_id>/reviews", methods=["POST"])
+@jwt_required()
+@studyset_owner_required
+def post_studyset_reviews(studyset_id):
+    """Record many answers at once: {"reviews": [{"flashcard_id", "grade", "reviewed_at"?}, ...]}"""
+    user_id = get_jwt_identity()
+    data = request.get_json(silent=True) or {}
+    try:
+        events = parse_review_events(studyset_id, user_id, data.get('reviews'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    unknown = find_unknown_flashcards(studyset_id, user_id, events)
+    if unknown:
+        return jsonify({"error": "Some flashcards are not in this study set", "unknown_flashcard_ids": unknown}), 400
+
+    result = submit_review_events(events)
+    # Buffered events are written by the next flush, so the answer is "accepted", not "done"
+    return jsonify(result), 202 if result['buffered'] else 200
+
+@studyset_bp.route("/<uuid:studyset_id>/export", methods=["GET"])
+@jwt_required()
+@studyset_owner_required
+def export_studyset_flashcards(studyset_id):
+    """Download every flashcard in the set as ?format=csv (default) or jsonl, streamed"""
+    export_format = request.args.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"error": f"Unsupported format: {export_format}"}), 400
+
+    return Response(
+        stream_with_context(stream_flashcards_export(studyset_id, export_format)),
+        mimetype=EXPORT_FORMATS[export_format],
+        headers={'Content-Disposition': f'attachment; filename="studyset-{studyset_id}.{export_format}"'}
+    )
+
+@studyset_bp.route("/<uuid:studyset_id>/import", methods=["POST"])
+@jwt_required()
+@studyset_owner_required
+def post_studyset_import(studyset_id):
+    """Add the cards from an uploaded CSV (question,answer header) or JSON Lines file"""
+    user_id = get_jwt_identity()
+
+    if 'file' not in request.files:
+        return jsonify({"error": "No file uploaded"}), 400
+
+    file = request.files['file']
+    if file.filename == '':
+        return jsonify({"error": "No file selected"}), 400
+
+    # ?format= wins; otherwise go by the extension
+    import_format = request.args.get('format') or file.filename.rsplit('.', 1)[-1].lower()
+    if import_format == 'ndjson':
+        import_format = 'jsonl'
+    if import_format not in EXPORT_FORMATS:
+        return jsonify({"error": "Upload a .csv or .jsonl file, or pass ?format="}), 400
+
+    try:
+        result = import_flashcards(studyset_id, user_id, file, import_format)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if result['imported']:
+        enqueue_signature_backfill(studyset_id)
+    return jsonify(result), 201
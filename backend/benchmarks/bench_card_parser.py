@@ -0,0 +1,48 @@
+"""Benchmark parse_cards against the corpus of malformed Gemini outputs.
+
+Run from backend/:  python -m benchmarks.bench_card_parser
+"""
+import json
+import os
+import time
+from utils.card_parser import parse_cards
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), 'corpus', 'gemini_outputs.json')
+ROUNDS = 200
+
+def load_corpus():
+    with open(CORPUS_PATH, encoding='utf-8') as f:
+        return json.load(f)
+
+def run():
+    results = []
+    for entry in load_corpus():
+        raw = entry['raw']
+        started = time.perf_counter()
+        for _ in range(ROUNDS):
+            cards = parse_cards(raw)
+        seconds = (time.perf_counter() - started) / ROUNDS
+        results.append({
+            'name': entry['name'],
+            'bytes': len(raw.encode('utf-8')),
+            'expected_cards': entry['expected_cards'],
+            'recovered_cards': len(cards),
+            'microseconds': round(seconds * 1e6, 1),
+            'mb_per_second': round(len(raw) / seconds / 1e6, 2),
+        })
+    return results
+
+def main():
+    results = run()
+    failures = 0
+    print(f"{'case':<24}{'bytes':>8}{'cards':>10}{'µs':>12}{'MB/s':>8}")
+    for result in results:
+        ok = result['recovered_cards'] == result['expected_cards']
+        failures += not ok
+        cards = f"{result['recovered_cards']}/{result['expected_cards']}"
+        print(f"{result['name']:<24}{result['bytes']:>8}{cards:>10}{result['microseconds']:>12}{result['mb_per_second']:>8}{'' if ok else '  ✗'}")
+    print(f"\n{len(results) - failures}/{len(results)} cases fully recovered")
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
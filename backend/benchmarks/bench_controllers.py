@@ -0,0 +1,134 @@
+"""Benchmark controller hot paths against the seeded database and a stub Gemini model.
+
+Seed first (python -m benchmarks.seed), then run from backend/:
+    python -m benchmarks.bench_controllers --save main      # record benchmarks/baselines/main.json
+    python -m benchmarks.bench_controllers --compare main   # exit 1 if any median regressed
+"""
+import argparse
+import json
+import uuid
+from sqlalchemy import delete, func, select
+from benchmarks.common import (
+    StubGeminiModel, compare, create_bench_app, install_stub_gemini, load_baseline, load_corpus,
+    measure, run_metadata, save_baseline
+)
+
+EDIT_BATCH = 100
+CREATE_BATCH = 100
+GENERATE_CHUNKS = 10
+
+def pick_targets():
+    """The power user, the largest set, and a mid-sized set to edit"""
+    from app import db
+    from app.models import Flashcard, StudySet
+
+    power_user_id = db.session.execute(
+        select(StudySet.user_id).group_by(StudySet.user_id).order_by(func.count().desc()).limit(1)
+    ).scalar_one()
+    set_sizes = select(Flashcard.studyset_id, func.count().label('cards')).group_by(Flashcard.studyset_id).subquery()
+    large_set_id = db.session.execute(
+        select(set_sizes.c.studyset_id).order_by(set_sizes.c.cards.desc()).limit(1)
+    ).scalar_one()
+    edit_set = db.session.execute(
+        select(StudySet.id, StudySet.user_id)
+        .join(set_sizes, set_sizes.c.studyset_id == StudySet.id)
+        .where(set_sizes.c.cards.between(EDIT_BATCH, 5 * EDIT_BATCH))
+        .order_by(StudySet.id).limit(1)
+    ).one()
+    return power_user_id, large_set_id, edit_set
+
+def run(rounds):
+    from app import db
+    from app.models import Flashcard
+    from app.controllers.studyset_controllers import get_all_studysets
+    from app.controllers.flashcard_controllers import create_flashcards, get_flashcards_by_studyset, update_flashcards
+    from utils.flashly_bot import CHUNK_TOKENS, CHARS_PER_TOKEN, FlashlyBot
+
+    corpus = [entry['raw'] for entry in load_corpus()]
+    install_stub_gemini(StubGeminiModel(corpus))
+    bot = FlashlyBot()
+
+    power_user_id, large_set_id, (edit_set_id, edit_user_id) = pick_targets()
+    edit_ids = [str(card.id) for card in db.session.execute(
+        select(Flashcard.id).where(Flashcard.studyset_id == edit_set_id).order_by(Flashcard.id).limit(EDIT_BATCH)
+    )]
+
+    results = {}
+    results['get_all_studysets[all]'] = measure(lambda: get_all_studysets(power_user_id), rounds)
+    results['get_all_studysets[limit=50]'] = measure(lambda: get_all_studysets(power_user_id, limit=50), rounds)
+    results['get_flashcards_by_studyset[limit=50]'] = measure(
+        lambda: get_flashcards_by_studyset(large_set_id, limit=50), rounds
+    )
+
+    created_ids = []
+    def create():
+        cards = [{'question': f'Benchmark question {i}?', 'answer': f'Answer {i}'} for i in range(CREATE_BATCH)]
+        created_ids.extend(uuid.UUID(card['id']) for card in create_flashcards(edit_set_id, edit_user_id, cards))
+    def remove_created():
+        db.session.execute(delete(Flashcard).where(Flashcard.id.in_(created_ids)))
+        db.session.commit()
+        created_ids.clear()
+    results[f'create_flashcards[{CREATE_BATCH}]'] = measure(create, rounds, after=remove_created)
+
+    # Alternate between two versions of the text so every round really changes every row
+    edit_round = [0]
+    def edit():
+        edit_round[0] += 1
+        update_flashcards(edit_set_id, edit_user_id, {'flashcards': [
+            {'id': card_id, 'question': f'Edited question {card_id} v{edit_round[0] % 2}?', 'answer': 'Edited answer'}
+            for card_id in edit_ids
+        ]})
+    results[f'update_flashcards[{EDIT_BATCH} edits]'] = measure(edit, rounds)
+
+    def parse_corpus():
+        for raw in corpus:
+            bot.clean_gemini_output(raw)
+    results['clean_gemini_output[corpus]'] = measure(parse_corpus, rounds)
+
+    page = 'lorem ipsum dolor sit amet ' * (CHUNK_TOKENS * CHARS_PER_TOKEN // 27)
+    document = '\f'.join(f'Section {index}. {page}' for index in range(GENERATE_CHUNKS))
+    results[f'generate_flashcards[stub, {GENERATE_CHUNKS} chunks]'] = measure(
+        lambda: bot.generate_flashcards(document), rounds
+    )
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--json', help='also write the results document to this path')
+    parser.add_argument('--save', metavar='NAME', help='record the results as benchmarks/baselines/NAME.json')
+    parser.add_argument('--compare', metavar='NAME', help='compare medians against a saved baseline')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed median slowdown, as a fraction')
+    args = parser.parse_args()
+
+    app = create_bench_app()
+    with app.app_context():
+        results = run(args.rounds)
+    document = {'meta': run_metadata(rounds=args.rounds), 'results': results}
+
+    print(f"{'benchmark':<44}{'median ms':>11}{'p95 ms':>10}{'min ms':>10}")
+    for name, result in results.items():
+        print(f"{name:<44}{result['median_ms']:>11}{result['p95_ms']:>10}{result['min_ms']:>10}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2, sort_keys=True)
+    if args.save:
+        save_baseline(args.save, document)
+        print(f"\n✅ Saved baseline {args.save}")
+
+    if args.compare:
+        baseline = load_baseline(args.compare)
+        rows, regressed = compare(results, baseline, args.threshold)
+        print(f"\nvs {args.compare} ({baseline['meta'].get('commit')})")
+        for name, previous, current, change in rows:
+            if change is None:
+                print(f"{name:<44}{'new':>11}{current:>10}")
+                continue
+            flag = '  ✗' if change > args.threshold else ''
+            print(f"{name:<44}{previous:>11}{current:>10}{change:>+10.1%}{flag}")
+        return 1 if regressed else 0
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
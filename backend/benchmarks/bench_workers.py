@@ -0,0 +1,101 @@
+"""Compare gunicorn worker profiles on an I/O-bound endpoint.
+
+Each profile from gunicorn.conf.py serves a stand-in endpoint that waits UPSTREAM_MS
+the way a Gemini call or OAuth token exchange does, then a pool of clients hammers it.
+
+Run from backend/:  python -m benchmarks.bench_workers [sync gthread gevent]
+"""
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, jsonify
+
+HOST = '127.0.0.1'
+PORT = int(os.getenv('BENCH_PORT', 8765))
+UPSTREAM_MS = int(os.getenv('BENCH_UPSTREAM_MS', 200))
+CLIENTS = int(os.getenv('BENCH_CLIENTS', 32))
+REQUESTS = int(os.getenv('BENCH_REQUESTS', 320))
+PROFILES = ('sync', 'gthread', 'gevent')
+
+app = Flask(__name__)
+
+@app.route('/upstream')
+def upstream():
+    # time.sleep is cooperative under gevent's monkey-patching, like a real socket wait
+    time.sleep(UPSTREAM_MS / 1000)
+    return jsonify({'ok': True})
+
+def _wait_for_port(deadline=15):
+    started = time.monotonic()
+    while time.monotonic() - started < deadline:
+        try:
+            socket.create_connection((HOST, PORT), timeout=0.2).close()
+            return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+def _request(_):
+    connection = http.client.HTTPConnection(HOST, PORT, timeout=120)
+    started = time.perf_counter()
+    try:
+        connection.request('GET', '/upstream')
+        ok = connection.getresponse().status == 200
+    except OSError:
+        ok = False
+    finally:
+        connection.close()
+    return ok, time.perf_counter() - started
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def run_profile(profile):
+    env = dict(os.environ, GUNICORN_PROFILE=profile)
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '-b', f'{HOST}:{PORT}',
+         'benchmarks.bench_workers:app'],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        if not _wait_for_port():
+            return {'profile': profile, 'error': 'server did not start'}
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=CLIENTS) as pool:
+            results = list(pool.map(_request, range(REQUESTS)))
+        elapsed = time.perf_counter() - started
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies = [seconds for ok, seconds in results if ok]
+    return {
+        'profile': profile,
+        'ok': len(latencies),
+        'errors': len(results) - len(latencies),
+        'requests_per_second': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(_percentile(latencies, 0.5) * 1000) if latencies else None,
+        'p95_ms': round(_percentile(latencies, 0.95) * 1000) if latencies else None,
+    }
+
+def main():
+    profiles = sys.argv[1:] or PROFILES
+    print(f"{UPSTREAM_MS} ms upstream wait, {CLIENTS} clients, {REQUESTS} requests, "
+          f"GUNICORN_WORKERS={os.getenv('GUNICORN_WORKERS', 1)}\n")
+    print(f"{'profile':<10}{'ok':>6}{'errors':>8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}")
+    for profile in profiles:
+        result = run_profile(profile)
+        if 'error' in result:
+            print(f"{profile:<10}  {result['error']}")
+            continue
+        print(f"{profile:<10}{result['ok']:>6}{result['errors']:>8}{result['requests_per_second']:>9}"
+              f"{result['p50_ms']:>9}{result['p95_ms']:>9}")
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,142 @@
+"""Shared plumbing for the database-backed benchmarks: app setup, a stub Gemini model,
+timing and baseline files."""
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+import zlib
+from datetime import datetime
+from types import SimpleNamespace
+from urllib.parse import urlparse
+
+BENCH_DATABASE_URL = os.getenv('BENCH_DATABASE_URL', 'postgresql://localhost/flashly_bench')
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), 'baselines')
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), 'corpus', 'gemini_outputs.json')
+
+def create_bench_app():
+    """The real app, pointed at the benchmark database with request profiling off"""
+    # config.py reads the environment at import time, so this must run before any app import
+    os.environ['DATABASE_URL'] = BENCH_DATABASE_URL
+    os.environ.setdefault('QUERY_PROFILING', 'false')
+    from app import create_app
+    return create_app()
+
+def check_bench_database(force=False):
+    # The seeder drops every table; refuse anything that does not look like a scratch database
+    name = urlparse(BENCH_DATABASE_URL).path.lstrip('/')
+    if 'bench' not in name and not force:
+        raise SystemExit(f"Refusing to use database {name!r}: its name must contain 'bench' (or pass --force)")
+
+def load_corpus():
+    with open(CORPUS_PATH, encoding='utf-8') as f:
+        return json.load(f)
+
+class StubGeminiModel:
+    """Stands in for GenerativeModel: answers each prompt with a corpus response after a fixed latency.
+
+    The response is picked by a checksum of the prompt, so runs are repeatable under any thread schedule.
+    """
+
+    def __init__(self, responses, latency=0.0, stream_part_size=256):
+        self.responses = responses
+        self.latency = latency
+        self.stream_part_size = stream_part_size
+
+    def generate_content(self, prompt, stream=False, request_options=None):
+        text = self.responses[zlib.crc32(prompt.encode('utf-8')) % len(self.responses)]
+        time.sleep(self.latency)
+        usage = SimpleNamespace(total_token_count=(len(prompt) + len(text)) // 4)
+        if stream:
+            parts = [
+                SimpleNamespace(text=text[i:i + self.stream_part_size])
+                for i in range(0, len(text), self.stream_part_size)
+            ]
+            return _StubStream(parts, usage)
+        return SimpleNamespace(text=text, usage_metadata=usage)
+
+class _StubStream(list):
+    def __init__(self, parts, usage):
+        super().__init__(parts)
+        self.usage_metadata = usage
+
+def install_stub_gemini(model):
+    """Swap the process-wide Gemini model for `model`, with a limiter that never waits"""
+    from utils import gemini_client
+    with gemini_client._registry_lock:
+        gemini_client._registry.update({
+            'pid': os.getpid(),
+            'model': model,
+            'limiter': gemini_client.GeminiRateLimiter(rpm=10**9, tpm=10**12, max_inflight=64),
+        })
+
+def measure(func, rounds, warmup=2, before=None, after=None):
+    """Time `func()` over `rounds` runs; `before`/`after` run untimed around each one"""
+    samples = []
+    for index in range(warmup + rounds):
+        if before:
+            before()
+        # The bot and controllers print progress lines; keep them out of the results table
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - started
+        if after:
+            after()
+        if index >= warmup:
+            samples.append(elapsed * 1000)
+    samples.sort()
+    return {
+        'rounds': rounds,
+        'min_ms': round(samples[0], 3),
+        'median_ms': round(statistics.median(samples), 3),
+        'p95_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        'mean_ms': round(statistics.fmean(samples), 3),
+    }
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_metadata(**extra):
+    return {
+        'commit': _git_commit(),
+        'recorded_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        **extra,
+    }
+
+def baseline_path(name):
+    return os.path.join(BASELINE_DIR, f'{name}.json')
+
+def save_baseline(name, document):
+    os.makedirs(BASELINE_DIR, exist_ok=True)
+    with open(baseline_path(name), 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+def load_baseline(name):
+    with open(baseline_path(name), encoding='utf-8') as f:
+        return json.load(f)
+
+def compare(results, baseline, threshold):
+    """Rows of (name, baseline median, current median, change) and whether any regressed past `threshold`"""
+    rows = []
+    regressed = False
+    for name, current in results.items():
+        previous = baseline['results'].get(name)
+        if previous is None:
+            rows.append((name, None, current['median_ms'], None))
+            continue
+        change = (current['median_ms'] - previous['median_ms']) / previous['median_ms'] if previous['median_ms'] else 0.0
+        regressed |= change > threshold
+        rows.append((name, previous['median_ms'], current['median_ms'], change))
+    return rows, regressed
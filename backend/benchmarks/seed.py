@@ -0,0 +1,102 @@
+"""Seed a scratch PostgreSQL database with realistic study sets for the benchmarks.
+
+Most sets are small, a few are large: cards per set follow a log-normal distribution
+(median ~30), and one power user owns POWER_USER_SETS sets including a LARGE_SET_CARDS card set.
+The same --seed always produces the same data. Every table is dropped and recreated.
+
+Run from backend/:  BENCH_DATABASE_URL=postgresql://localhost/flashly_bench python -m benchmarks.seed
+"""
+import argparse
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import text
+from benchmarks.common import check_bench_database, create_bench_app
+
+POWER_USER_SETS = 300
+LARGE_SET_CARDS = 20000
+MAX_SET_CARDS = 5000
+VOCABULARY_SIZE = 2000
+
+def make_vocabulary(rng):
+    syllables = ['ka', 'lo', 'mi', 'ne', 'su', 'ta', 'ri', 'po', 'da', 've', 'xo', 'bel', 'tor', 'sin', 'gra']
+    return [''.join(rng.choice(syllables) for _ in range(rng.randint(2, 4))) for _ in range(VOCABULARY_SIZE)]
+
+def make_card(rng, vocabulary):
+    question = ' '.join(rng.choices(vocabulary, k=rng.randint(8, 20))).capitalize() + '?'
+    answer = ' '.join(rng.choices(vocabulary, k=rng.randint(3, 12))).capitalize()
+    return {'question': question, 'answer': answer}
+
+def cards_per_set(rng):
+    return max(1, min(MAX_SET_CARDS, int(rng.lognormvariate(3.4, 1.0))))
+
+def seed(users, seed_value):
+    from app import db
+    from app.models import StudySet, User
+    from app.controllers.flashcard_controllers import bulk_insert_flashcards
+
+    rng = random.Random(seed_value)
+    vocabulary = make_vocabulary(rng)
+    now = datetime.now()
+
+    db.drop_all()
+    # create_all skips migrations, so install the extension the (user_id, search_vector) GIN index needs
+    db.session.execute(text('CREATE EXTENSION IF NOT EXISTS btree_gin'))
+    db.session.commit()
+    db.create_all()
+
+    totals = {'users': 0, 'studysets': 0, 'flashcards': 0}
+    for user_index in range(users):
+        user = User(
+            id=uuid.UUID(int=rng.getrandbits(128)),
+            username=f'bench_user_{user_index}',
+            email=f'bench_user_{user_index}@example.com'
+        )
+        db.session.add(user)
+        db.session.flush()
+        totals['users'] += 1
+
+        power_user = user_index == 0
+        set_count = POWER_USER_SETS if power_user else max(1, int(rng.lognormvariate(1.5, 0.8)))
+        for set_index in range(set_count):
+            created = now - timedelta(days=rng.uniform(0, 365))
+            studyset = StudySet(
+                id=uuid.UUID(int=rng.getrandbits(128)),
+                user_id=user.id,
+                title=' '.join(rng.choices(vocabulary, k=3)).title(),
+                description='',
+                created_at=created,
+                updated_at=created + timedelta(days=rng.uniform(0, (now - created).days or 1))
+            )
+            db.session.add(studyset)
+            db.session.flush()
+
+            count = LARGE_SET_CARDS if power_user and set_index == 0 else cards_per_set(rng)
+            bulk_insert_flashcards(studyset.id, user.id, [make_card(rng, vocabulary) for _ in range(count)])
+            totals['studysets'] += 1
+            totals['flashcards'] += count
+        db.session.commit()
+
+    db.session.execute(text('ANALYZE'))
+    db.session.commit()
+    return totals
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--force', action='store_true', help="allow a database whose name lacks 'bench'")
+    args = parser.parse_args()
+
+    check_bench_database(args.force)
+    app = create_bench_app()
+    started = time.perf_counter()
+    with app.app_context():
+        totals = seed(args.users, args.seed)
+    print(f"✅ Seeded {totals['users']} users, {totals['studysets']} study sets, "
+          f"{totals['flashcards']} flashcards in {time.perf_counter() - started:.1f}s")
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,9 +1,33 @@
 import os
+from utils.db_pool import InstrumentedQueuePool
+
+def engine_options(pool_size, max_overflow, statement_timeout_ms):
+    """SQLAlchemy engine options; each value can be overridden from the environment"""
+    statement_timeout_ms = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", statement_timeout_ms))
+    options = {
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': int(os.getenv("DB_POOL_SIZE", pool_size)),
+        'max_overflow': int(os.getenv("DB_MAX_OVERFLOW", max_overflow)),
+        'pool_timeout': float(os.getenv("DB_POOL_TIMEOUT", 10)),  # seconds to wait for a free connection
+        'pool_recycle': int(os.getenv("DB_POOL_RECYCLE", 1800)),  # replace connections before the server or a proxy drops them
+        'pool_pre_ping': True,  # survive idle disconnects and database restarts
+    }
+    # 0 disables it, e.g. behind a transaction-mode PgBouncer that rejects startup options
+    if statement_timeout_ms:
+        options['connect_args'] = {'options': f'-c statement_timeout={statement_timeout_ms}'}
+    return options
 
 class Config:
     # Local Database (pgAdmin4)
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Sized for one gthread worker: 8 request threads plus the background job threads
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(pool_size=10, max_overflow=5, statement_timeout_ms=30000)
+
+    # Per-request query count and DB time in Server-Timing; slow requests and repeated statements are logged
+    QUERY_PROFILING = os.getenv("QUERY_PROFILING", "true").lower() == "true"
+    SLOW_REQUEST_MS = int(os.getenv("SLOW_REQUEST_MS", 1000))
+    N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", 0))  # 0 disables the check
 
     # Secret Key
     SECRET_KEY = os.getenv("SECRET_KEY")
@@ -21,8 +45,43 @@ class Config:
     CORS_ORIGINS = [os.getenv("FRONTEND_URL", "https://flashly-rftw.vercel.app")]
     CORS_METHODS = ["GET", "POST", "PUT", "DELETE", "OPTIONS"]
     CORS_HEADERS = ["Content-Type", "Authorization"]
+    CORS_EXPOSE_HEADERS = ["X-Next-Cursor", "ETag"]  # Pagination cursor for GET /studysets/, validators for conditional GETs
     CORS_SUPPORTS_CREDENTIALS = True  # Required for cookies
 
+    # AI generation cache: in-process LRU in front of the generation_cache table
+    GENERATION_CACHE_MEMORY_SIZE = int(os.getenv("GENERATION_CACHE_MEMORY_SIZE", 128))
+    GENERATION_CACHE_MAX_ENTRIES = int(os.getenv("GENERATION_CACHE_MAX_ENTRIES", 5000))
+    GENERATION_CACHE_TTL = int(os.getenv("GENERATION_CACHE_TTL", 30 * 24 * 3600))  # seconds
+
+    # Serialized GET bodies kept per worker, keyed by study set / user and validated by ETag
+    RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", 512))
+
+    # Study set owner lookups behind the ownership check on every /studysets/<id> route
+    STUDYSET_OWNER_CACHE_SIZE = int(os.getenv("STUDYSET_OWNER_CACHE_SIZE", 4096))
+    STUDYSET_OWNER_CACHE_TTL = int(os.getenv("STUDYSET_OWNER_CACHE_TTL", 60))  # seconds
+
+    # Background preview jobs: threads per worker process, and when an unfinished job counts as lost
+    GENERATION_JOB_WORKERS = int(os.getenv("GENERATION_JOB_WORKERS", 2))
+    GENERATION_JOB_TIMEOUT = int(os.getenv("GENERATION_JOB_TIMEOUT", 15 * 60))  # seconds
+
+    # Review events are buffered per worker and written in bulk every REVIEW_FLUSH_INTERVAL seconds,
+    # or sooner once REVIEW_FLUSH_SIZE are waiting; an interval of 0 writes each batch in its request
+    REVIEW_FLUSH_INTERVAL = float(os.getenv("REVIEW_FLUSH_INTERVAL", 2))
+    REVIEW_FLUSH_SIZE = int(os.getenv("REVIEW_FLUSH_SIZE", 500))
+    REVIEW_BATCH_MAX = int(os.getenv("REVIEW_BATCH_MAX", 1000))  # events accepted per request
+
+    # Largest deck one import request may load
+    IMPORT_MAX_ROWS = int(os.getenv("IMPORT_MAX_ROWS", 200000))
+
+    # Seconds before a token exchange or userinfo call to a provider gives up and frees the worker
+    OAUTH_HTTP_TIMEOUT = float(os.getenv("OAUTH_HTTP_TIMEOUT", 10))
+
+    # Bearer token for the /internal/* operator endpoints; unset serves them in development only
+    INTERNAL_TOKEN = os.getenv("INTERNAL_TOKEN")
+
+    # Bearer token Prometheus must send to scrape /metrics; unset serves it in development only
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
     # OAuth2 Providers Configuration
     OAUTH2_PROVIDERS = {
         'google': {
@@ -56,6 +115,8 @@ class Config:
 
 class DevelopmentConfig(Config):
     DEBUG = True
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(pool_size=5, max_overflow=5, statement_timeout_ms=60000)
+    N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", 5))
     JWT_COOKIE_SECURE = False
     JWT_COOKIE_SAMESITE = "Lax"  # More permissive for development
     CORS_ORIGINS = ["http://localhost:3000", "http://localhost:5173"]  # Common frontend ports
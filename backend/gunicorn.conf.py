@@ -1,9 +1,55 @@
 # Gunicorn config for unlimited flashcards
+import os
+import shutil
+import tempfile
+
+# Prometheus multiprocess mode: workers write samples to files here and /metrics sums them.
+# Must be set before prometheus_client is imported by the preloaded app; cleared on each start.
+if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+    metrics_dir = os.path.join(tempfile.gettempdir(), "flashly-prometheus")
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir)
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = metrics_dir
+
+# Worker profile (GUNICORN_PROFILE):
+#   sync    - one request at a time per worker; any slow Gemini or OAuth call blocks it
+#   gthread - GUNICORN_THREADS requests per worker on OS threads (default)
+#   gevent  - GUNICORN_CONNECTIONS greenlets per worker; needs the gevent extra (`uv sync --extra gevent`)
+profile = os.getenv("GUNICORN_PROFILE", "gthread")
+if profile not in ("sync", "gthread", "gevent"):
+    raise ValueError(f"Unknown GUNICORN_PROFILE: {profile}")
+
+if profile == "gevent":
+    # The app is preloaded in the master, so patch before anything imports socket/threading,
+    # then make psycopg2 and gRPC (used by the Gemini SDK) yield to the hub instead of blocking it
+    from gevent import monkey
+    monkey.patch_all()
+    from psycogreen.gevent import patch_psycopg
+    patch_psycopg()
+    import grpc.experimental.gevent
+    grpc.experimental.gevent.init_gevent()
+
 bind = "0.0.0.0:8000"
-workers = 1
-worker_class = "sync"
+workers = int(os.getenv("GUNICORN_WORKERS", 1))
+worker_class = profile
+threads = int(os.getenv("GUNICORN_THREADS", 8)) if profile == "gthread" else 1
+worker_connections = int(os.getenv("GUNICORN_CONNECTIONS", 100))  # gevent only
 timeout = 120  # 2 minutes for large flashcard generation
 keepalive = 2
 max_requests = 100
 max_requests_jitter = 10
-preload_app = True
\ No newline at end of file
+preload_app = True
+
+def post_fork(server, worker):
+    # Connections opened in the master while preloading must not be shared across workers
+    app = server.app.callable
+    sqlalchemy = getattr(app, "extensions", {}).get("sqlalchemy")
+    if sqlalchemy is not None:
+        with app.app_context():
+            for engine in sqlalchemy.engines.values():
+                engine.dispose(close=False)
+
+def child_exit(server, worker):
+    # Drop the dead worker's live gauges (pool occupancy); its counters keep counting toward totals
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
@@ -97,6 +97,10 @@ def run_migrations_online():
     connectable = get_engine()
 
     with connectable.connect() as connection:
+        # The app's statement_timeout is meant for requests; index builds and backfills need longer
+        if connection.dialect.name == 'postgresql':
+            connection.exec_driver_sql('SET statement_timeout = 0')
+
         context.configure(
             connection=connection,
             target_metadata=get_metadata(),
@@ -0,0 +1,54 @@
+"""Add review_states table for spaced repetition
+
+Revision ID: 1f6a2c8d4b90
+Revises: e3b7f0a9c2d6
+Create Date: 2026-10-18 17:42:19.305817
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '1f6a2c8d4b90'
+down_revision = 'e3b7f0a9c2d6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('review_states',
+    sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('flashcard_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('studyset_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('repetitions', sa.Integer(), nullable=False),
+    sa.Column('interval_days', sa.Float(), nullable=False),
+    sa.Column('ease_factor', sa.Float(), nullable=False),
+    sa.Column('lapses', sa.Integer(), nullable=False),
+    sa.Column('reviews_count', sa.Integer(), nullable=False),
+    sa.Column('due_at', sa.DateTime(), nullable=False),
+    sa.Column('last_reviewed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['flashcard_id'], ['flashcards.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['studyset_id'], ['studysets.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'flashcard_id')
+    )
+    with op.batch_alter_table('review_states', schema=None) as batch_op:
+        batch_op.create_index('ix_review_states_user_id_due_at', ['user_id', 'due_at'], unique=False)
+        batch_op.create_index('ix_review_states_user_id_studyset_id_due_at', ['user_id', 'studyset_id', 'due_at'], unique=False)
+
+    # Every existing card starts out new and due from the moment it was created
+    op.execute(
+        "INSERT INTO review_states "
+        "(user_id, flashcard_id, studyset_id, repetitions, interval_days, ease_factor, lapses, reviews_count, due_at) "
+        "SELECT user_id, id, studyset_id, 0, 0, 2.5, 0, 0, coalesce(created_at, now()) FROM flashcards"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('review_states', schema=None) as batch_op:
+        batch_op.drop_index('ix_review_states_user_id_studyset_id_due_at')
+        batch_op.drop_index('ix_review_states_user_id_due_at')
+
+    op.drop_table('review_states')
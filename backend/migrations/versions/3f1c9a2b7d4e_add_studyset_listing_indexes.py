@@ -0,0 +1,32 @@
+"""Add indexes for study set listing
+
+Revision ID: 3f1c9a2b7d4e
+Revises: 22ef8aae3aa8
+Create Date: 2026-10-18 09:12:44.215630
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c9a2b7d4e'
+down_revision = '22ef8aae3aa8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keyset pagination over (updated_at, id) per user, and the flashcard count join
+    with op.batch_alter_table('studysets', schema=None) as batch_op:
+        batch_op.create_index('ix_studysets_user_id_updated_at_id', ['user_id', 'updated_at', 'id'], unique=False)
+
+    with op.batch_alter_table('flashcards', schema=None) as batch_op:
+        batch_op.create_index('ix_flashcards_studyset_id', ['studyset_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('flashcards', schema=None) as batch_op:
+        batch_op.drop_index('ix_flashcards_studyset_id')
+
+    with op.batch_alter_table('studysets', schema=None) as batch_op:
+        batch_op.drop_index('ix_studysets_user_id_updated_at_id')
@@ -0,0 +1,31 @@
+"""Replace the flashcard search index with a (user_id, search_vector) GIN index
+
+Revision ID: 4e7b2a9c6f31
+Revises: b94c1e7d2f58
+Create Date: 2026-10-18 23:12:40.318207
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '4e7b2a9c6f31'
+down_revision = 'b94c1e7d2f58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # btree_gin lets the uuid user_id sit in the same GIN index as the tsvector,
+    # so a search only visits the searching user's postings
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gin")
+
+    with op.batch_alter_table('flashcards', schema=None) as batch_op:
+        batch_op.create_index('ix_flashcards_user_id_search_vector', ['user_id', 'search_vector'], unique=False, postgresql_using='gin')
+        batch_op.drop_index('ix_flashcards_search_vector', postgresql_using='gin')
+
+
+def downgrade():
+    with op.batch_alter_table('flashcards', schema=None) as batch_op:
+        batch_op.create_index('ix_flashcards_search_vector', ['search_vector'], unique=False, postgresql_using='gin')
+        batch_op.drop_index('ix_flashcards_user_id_search_vector', postgresql_using='gin')
@@ -0,0 +1,28 @@
+"""Add flashcard pagination index
+
+Revision ID: 5b8e2d41c7a9
+Revises: 3f1c9a2b7d4e
+Create Date: 2026-10-18 10:03:18.442071
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '5b8e2d41c7a9'
+down_revision = '3f1c9a2b7d4e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # (studyset_id, created_at, id) covers every lookup the single-column index did
+    with op.batch_alter_table('flashcards', schema=None) as batch_op:
+        batch_op.drop_index('ix_flashcards_studyset_id')
+        batch_op.create_index('ix_flashcards_studyset_id_created_at_id', ['studyset_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('flashcards', schema=None) as batch_op:
+        batch_op.drop_index('ix_flashcards_studyset_id_created_at_id')
+        batch_op.create_index('ix_flashcards_studyset_id', ['studyset_id'], unique=False)
@@ -0,0 +1,41 @@
+"""Add review_events table
+
+Revision ID: 6d2e9b4f7a13
+Revises: 1f6a2c8d4b90
+Create Date: 2026-10-18 19:08:51.427390
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '6d2e9b4f7a13'
+down_revision = '1f6a2c8d4b90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('review_events',
+    sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('flashcard_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('studyset_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('grade', sa.SmallInteger(), nullable=False),
+    sa.Column('reviewed_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['flashcard_id'], ['flashcards.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['studyset_id'], ['studysets.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('review_events', schema=None) as batch_op:
+        batch_op.create_index('ix_review_events_user_id_reviewed_at', ['user_id', 'reviewed_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('review_events', schema=None) as batch_op:
+        batch_op.drop_index('ix_review_events_user_id_reviewed_at')
+
+    op.drop_table('review_events')
@@ -0,0 +1,60 @@
+"""Add user_stats table and flashcards.is_ai_generated
+
+Revision ID: b94c1e7d2f58
+Revises: 6d2e9b4f7a13
+Create Date: 2026-10-18 20:31:07.662194
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'b94c1e7d2f58'
+down_revision = '6d2e9b4f7a13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Card origin was never recorded, so existing cards start out counted as manual
+    with op.batch_alter_table('flashcards', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('is_ai_generated', sa.Boolean(), server_default=sa.false(), nullable=False))
+
+    op.create_table('user_stats',
+    sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('total_flashcards', sa.Integer(), nullable=False),
+    sa.Column('ai_flashcards', sa.Integer(), nullable=False),
+    sa.Column('cards_per_set', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+    # One row per user, with every study set in cards_per_set (empty ones included)
+    op.execute("""
+        INSERT INTO user_stats (user_id, total_flashcards, ai_flashcards, cards_per_set, updated_at)
+        SELECT users.id,
+               coalesce(sum(sets.cards), 0),
+               coalesce(sum(sets.ai_cards), 0),
+               coalesce(jsonb_object_agg(sets.id::text, sets.cards) FILTER (WHERE sets.id IS NOT NULL), '{}'::jsonb),
+               now()
+        FROM users
+        LEFT JOIN (
+            SELECT studysets.id, studysets.user_id,
+                   count(flashcards.id) AS cards,
+                   count(flashcards.id) FILTER (WHERE flashcards.is_ai_generated) AS ai_cards
+            FROM studysets
+            LEFT JOIN flashcards ON flashcards.studyset_id = studysets.id
+            GROUP BY studysets.id
+        ) AS sets ON sets.user_id = users.id
+        GROUP BY users.id
+    """)
+
+
+def downgrade():
+    op.drop_table('user_stats')
+
+    with op.batch_alter_table('flashcards', schema=None) as batch_op:
+        batch_op.drop_column('is_ai_generated')
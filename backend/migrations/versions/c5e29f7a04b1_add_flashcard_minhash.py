@@ -0,0 +1,27 @@
+"""Add minhash signature to flashcards
+
+Revision ID: c5e29f7a04b1
+Revises: a17d3c5e9b62
+Create Date: 2026-10-18 14:52:36.604219
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5e29f7a04b1'
+down_revision = 'a17d3c5e9b62'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing rows keep NULL; near-duplicate checks hash their question on the fly
+    with op.batch_alter_table('flashcards', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('minhash', sa.LargeBinary(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('flashcards', schema=None) as batch_op:
+        batch_op.drop_column('minhash')
@@ -0,0 +1,41 @@
+"""Add full-text search vector to flashcards
+
+Revision ID: d8a4b6c1e3f5
+Revises: c5e29f7a04b1
+Create Date: 2026-10-18 15:48:12.730561
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8a4b6c1e3f5'
+down_revision = 'c5e29f7a04b1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Stored generated column: Postgres fills it for existing rows and keeps it in sync on writes
+    with op.batch_alter_table('flashcards', schema=None) as batch_op:
+        batch_op.add_column(sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english', coalesce(question, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(answer, '')), 'B')",
+                persisted=True
+            ),
+            nullable=True
+        ))
+        batch_op.create_index('ix_flashcards_search_vector', ['search_vector'], unique=False, postgresql_using='gin')
+        batch_op.create_index('ix_flashcards_user_id', ['user_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('flashcards', schema=None) as batch_op:
+        batch_op.drop_index('ix_flashcards_user_id')
+        batch_op.drop_index('ix_flashcards_search_vector', postgresql_using='gin')
+        batch_op.drop_column('search_vector')
@@ -0,0 +1,26 @@
+"""Add version stamp to studysets
+
+Revision ID: e3b7f0a9c2d6
+Revises: d8a4b6c1e3f5
+Create Date: 2026-10-18 16:31:05.118274
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3b7f0a9c2d6'
+down_revision = 'd8a4b6c1e3f5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('studysets', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('studysets', schema=None) as batch_op:
+        batch_op.drop_column('version')
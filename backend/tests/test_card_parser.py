@@ -0,0 +1,66 @@
+import pytest
+
+from utils.card_parser import CardStreamParser, parse_cards
+
+CARD_A = {'question': 'a', 'answer': 'b'}
+CARD_C = {'question': 'c', 'answer': 'd'}
+
+
+def feed_in_pieces(text, size):
+    parser = CardStreamParser()
+    cards = []
+    for start in range(0, len(text), size):
+        cards.extend(parser.feed(text[start:start + size]))
+    return cards
+
+
+def test_plain_array():
+    assert parse_cards('[{"question": "a", "answer": "b"}, {"question": "c", "answer": "d"}]') == [CARD_A, CARD_C]
+
+
+def test_code_fence_and_chatter_are_skipped():
+    raw = 'Here you go:\n```json\n[{"question": "a", "answer": "b"}]\n```\nGood luck!'
+    assert parse_cards(raw) == [CARD_A]
+
+
+def test_closed_wrapper():
+    assert parse_cards('{"flashcards": [{"question": "a", "answer": "b"}, {"question": "c", "answer": "d"}]}') == [CARD_A, CARD_C]
+
+
+def test_truncated_array_keeps_completed_cards():
+    assert parse_cards('[{"question": "a", "answer": "b"}, {"question": "c", "ans') == [CARD_A]
+
+
+def test_truncated_wrapper_keeps_completed_cards():
+    raw = '{"flashcards":[{"question":"a","answer":"b"},{"question":"c","answer":"d"},{"question":"e'
+    assert parse_cards(raw) == [CARD_A, CARD_C]
+
+
+def test_truncated_escaped_wrapper_keeps_completed_cards():
+    raw = r'{\"flashcards\":[{\"question\":\"a\",\"answer\":\"b\"},{\"question\":\"c\",\"answer\":\"d\"},{\"question'
+    assert parse_cards(raw) == [CARD_A, CARD_C]
+
+
+@pytest.mark.parametrize('size', [1, 3, 7])
+def test_streamed_wrapper_emits_each_card_once(size):
+    raw = '{"flashcards": [{"question": "a", "answer": "b"}, {"question": "c", "answer": "d"}]}'
+    assert feed_in_pieces(raw, size) == [CARD_A, CARD_C]
+
+
+def test_braces_inside_strings_are_not_structural():
+    raw = '[{"question": "What is {x}?", "answer": "a \\"}\\" set"}]'
+    assert parse_cards(raw) == [{'question': 'What is {x}?', 'answer': 'a "}" set'}]
+
+
+def test_invalid_escapes_are_repaired():
+    assert parse_cards(r'[{"question": "it\'s \d", "answer": "b"}]') == [{'question': "it's \\d", 'answer': 'b'}]
+
+
+def test_objects_without_both_fields_are_ignored():
+    assert parse_cards('[{"question": "a"}, {"Question": "c", "ANSWER": "d"}]') == [CARD_C]
+
+
+def test_cards_without_text_fields_are_skipped():
+    raw = ('[{"question": 1, "answer": null}, {"question": "a", "answer": ["b"]},'
+           ' {"question": " ", "answer": "x"}, {"question": "a", "answer": "b"}]')
+    assert parse_cards(raw) == [CARD_A]
@@ -0,0 +1,87 @@
+import pytest
+
+from utils import lru_cache
+from utils.lru_cache import LRUCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(lru_cache.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_get_returns_default_on_miss():
+    cache = LRUCache(maxsize=2)
+    assert cache.get('missing') is None
+    assert cache.get('missing', 'fallback') == 'fallback'
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert len(cache) == 2
+
+
+def test_set_existing_key_refreshes_recency():
+    cache = LRUCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.set('a', 10)
+    cache.set('c', 3)
+    assert cache.get('a') == 10
+    assert cache.get('b') is None
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = LRUCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+    clock[0] += 59
+    assert cache.get('a') == 1
+    clock[0] += 2
+    assert cache.get('a') is None
+    # Expired entries are dropped on lookup
+    assert len(cache) == 0
+
+
+def test_per_entry_ttl_overrides_default(clock):
+    cache = LRUCache(maxsize=2, ttl=60)
+    cache.set('short', 1, ttl=5)
+    cache.set('default', 2)
+    clock[0] += 10
+    assert cache.get('short') is None
+    assert cache.get('default') == 2
+
+
+def test_no_ttl_never_expires(clock):
+    cache = LRUCache(maxsize=2)
+    cache.set('a', 1)
+    clock[0] += 10 ** 9
+    assert cache.get('a') == 1
+
+
+def test_stats_count_hits_and_misses(clock):
+    cache = LRUCache(maxsize=2, ttl=1)
+    cache.set('a', 1)
+    cache.get('a')
+    cache.get('b')
+    clock[0] += 2
+    cache.get('a')
+    assert cache.stats() == {'size': 0, 'maxsize': 2, 'hits': 1, 'misses': 2, 'hit_ratio': 0.3333}
+
+
+def test_delete_and_clear():
+    cache = LRUCache(maxsize=3)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.delete('a')
+    cache.delete('missing')
+    assert cache.get('a') is None
+    cache.clear()
+    assert len(cache) == 0
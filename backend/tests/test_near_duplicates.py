@@ -0,0 +1,46 @@
+from utils.near_duplicates import NUM_PERMUTATIONS, NearDuplicateIndex, minhash, normalize, shingles, similarity
+
+QUESTION = "What is the powerhouse of the cell and what does it produce?"
+
+
+def test_normalize_ignores_case_and_punctuation():
+    assert normalize("  What's the  CELL's powerhouse?? ") == "what s the cell s powerhouse"
+
+
+def test_short_text_is_one_shingle():
+    assert shingles("ATP") == {"atp"}
+    assert shingles("abcde") == {"abcd", "bcde"}
+
+
+def test_signature_is_deterministic_and_fixed_size():
+    signature = minhash(QUESTION)
+    assert signature == minhash(QUESTION)
+    assert len(signature) == NUM_PERMUTATIONS * 4
+
+
+def test_formatting_differences_do_not_change_signature():
+    assert minhash(QUESTION) == minhash("what is the POWERHOUSE of the cell, and what does it produce")
+
+
+def test_similarity_bounds():
+    assert similarity(minhash(QUESTION), minhash(QUESTION)) == 1.0
+    assert similarity(minhash(QUESTION), minhash("Name the capital city of Australia.")) < 0.5
+
+
+def test_index_finds_reworded_question():
+    index = NearDuplicateIndex()
+    index.add("cell", minhash(QUESTION))
+    index.add("capital", minhash("Name the capital city of Australia."))
+    assert index.find(minhash("What is the powerhouse of a cell and what does it produce?")) == "cell"
+    assert index.find(minhash("What is the powerhouse of the cell and what does it produce for us?")) == "cell"
+
+
+def test_index_ignores_related_but_different_questions():
+    index = NearDuplicateIndex()
+    index.add("cell", minhash(QUESTION))
+    assert index.find(minhash("Which organelle is the powerhouse of the cell?")) is None
+    assert index.find(minhash("Who wrote the novel Pride and Prejudice?")) is None
+
+
+def test_empty_index_finds_nothing():
+    assert NearDuplicateIndex().find(minhash(QUESTION)) is None
@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from utils.scheduler import (
+    DEFAULT_EASE, FIRST_INTERVAL_DAYS, MIN_EASE, RELEARN_DELAY, SECOND_INTERVAL_DAYS, next_review, parse_grade,
+)
+
+NOW = datetime(2026, 1, 1, 9, 0)
+
+
+@pytest.mark.parametrize('value, grade', [
+    ('again', 1), ('hard', 3), ('good', 4), ('easy', 5), (' Good ', 4), (0, 0), (5, 5), ('3', 3),
+])
+def test_parse_grade(value, grade):
+    assert parse_grade(value) == grade
+
+
+@pytest.mark.parametrize('value', ['meh', None, True, -1, 6, '7', 2.5j])
+def test_parse_grade_rejects(value):
+    with pytest.raises(ValueError):
+        parse_grade(value)
+
+
+def test_passing_reviews_follow_sm2_intervals():
+    state = (0, 0.0, DEFAULT_EASE, 0)
+    intervals = []
+    for _ in range(4):
+        *state, due_at = next_review(*state, grade=4, now=NOW)
+        intervals.append(state[1])
+        assert due_at == NOW + timedelta(days=state[1])
+    # "good" leaves the ease at 2.5: 1, 6, then the previous interval times the ease
+    assert intervals == [FIRST_INTERVAL_DAYS, SECOND_INTERVAL_DAYS, 15.0, 37.5]
+    assert state[0] == 4
+    assert state[2] == pytest.approx(DEFAULT_EASE)
+
+
+def test_ease_moves_with_grade():
+    _, _, easy_ease, _, _ = next_review(0, 0.0, DEFAULT_EASE, 0, 5, NOW)
+    _, _, hard_ease, _, _ = next_review(0, 0.0, DEFAULT_EASE, 0, 3, NOW)
+    assert easy_ease == pytest.approx(2.6)
+    assert hard_ease == pytest.approx(2.36)
+
+
+def test_failed_review_resets_and_relearns_soon():
+    repetitions, interval, ease, lapses, due_at = next_review(3, 15.0, DEFAULT_EASE, 0, 1, NOW)
+    assert (repetitions, interval, lapses) == (0, 0.0, 1)
+    assert ease == pytest.approx(1.96)
+    assert due_at == NOW + RELEARN_DELAY
+
+
+def test_relearned_card_starts_over_at_first_interval():
+    state = next_review(3, 15.0, DEFAULT_EASE, 0, 1, NOW)[:4]
+    repetitions, interval, _, lapses, _ = next_review(*state, grade=4, now=NOW)
+    assert (repetitions, interval, lapses) == (1, FIRST_INTERVAL_DAYS, 1)
+
+
+def test_ease_never_drops_below_floor():
+    ease = DEFAULT_EASE
+    for _ in range(10):
+        _, _, ease, _, _ = next_review(0, 0.0, ease, 0, 0, NOW)
+    assert ease == MIN_EASE
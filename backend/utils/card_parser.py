@@ -0,0 +1,164 @@
+import json
+import re
+
+# Every backslash pair, matched left to right so an escaped backslash is never split
+ESCAPE_PAIR = re.compile(r'\\(.)', re.DOTALL)
+
+# Outside escaped objects, only these characters can change the scanner state
+SIGNIFICANT = re.compile(r'[{}"\\]')
+NON_SPACE = re.compile(r'\S')
+
+_ESCAPED_CHARS = {'n': '\n', 't': '\t', 'r': '\r', '"': '"', '\\': '\\', '/': '/'}
+
+class CardStreamParser:
+    """Single-pass, tolerant extraction of flashcard objects from model output.
+
+    Text is fed in arbitrary pieces; every top-level {...} object is returned as soon as
+    its closing brace arrives, and cards nested in a wrapper ({"flashcards": [...]}) as soon
+    as each card closes. Anything outside objects (array brackets, commas, code fences,
+    chatter) is skipped, so a cut-off response still yields every card that was completed,
+    wrapped or not. Objects the model emitted JSON-string-escaped ({\\"question\\": ...}) are
+    unescaped on the fly. Only the object currently being read is buffered.
+    """
+
+    def __init__(self):
+        self._buffer = []
+        # Buffer offsets where the currently open nested objects start
+        self._nested_starts = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        # None until the first significant character after '{' shows whether quotes are escaped
+        self._escaped_object = None
+        self._pending_backslash = False
+
+    def feed(self, text):
+        cards = []
+        index = 0
+        length = len(text)
+        while index < length:
+            if self._depth == 0:
+                start = text.find('{', index)
+                if start < 0:
+                    break
+                self._start_object()
+                index = start + 1
+                continue
+
+            if self._escaped_object is None:
+                match = NON_SPACE.search(text, index)
+                if match is None:
+                    self._buffer.append(text[index:])
+                    break
+                self._escaped_object = text[match.start()] == '\\'
+
+            if self._escaped_object:
+                # Undo one level of string escaping before the structural scan
+                char = text[index]
+                index += 1
+                if self._pending_backslash:
+                    self._pending_backslash = False
+                    char = _ESCAPED_CHARS.get(char, '\\' + char)
+                elif char == '\\':
+                    self._pending_backslash = True
+                    continue
+                # An unrecognised escape decodes to two characters
+                for decoded in char:
+                    cards.extend(self._scan(decoded))
+                continue
+
+            if self._escaped:
+                # The character after a backslash inside a string is never structural
+                self._buffer.append(text[index])
+                self._escaped = False
+                index += 1
+                continue
+
+            # Plain object: jump straight to the next character that can change state
+            match = SIGNIFICANT.search(text, index)
+            if match is None:
+                self._buffer.append(text[index:])
+                break
+            position = match.start()
+            self._buffer.append(text[index:position])
+            cards.extend(self._scan(text[position]))
+            index = position + 1
+        return cards
+
+    def _start_object(self):
+        self._depth = 1
+        self._buffer = ['{']
+        self._nested_starts = []
+        self._in_string = False
+        self._escaped = False
+        self._escaped_object = None
+        self._pending_backslash = False
+
+    def _scan(self, char):
+        self._buffer.append(char)
+        if self._in_string:
+            if self._escaped:
+                self._escaped = False
+            elif char == '\\':
+                self._escaped = True
+            elif char == '"':
+                self._in_string = False
+        elif char == '"':
+            self._in_string = True
+        elif char == '{':
+            self._depth += 1
+            self._nested_starts.append(len(self._buffer) - 1)
+        elif char == '}':
+            self._depth -= 1
+            if self._depth == 0:
+                raw = ''.join(self._buffer)
+                self._buffer = []
+                return decode_cards(raw)
+            start = self._nested_starts.pop()
+            cards = decode_cards(''.join(self._buffer[start:]))
+            if cards:
+                # Emitted now, so drop it: the wrapper may never close, and must not repeat it if it does
+                del self._buffer[start:]
+                return cards
+        return ()
+
+def decode_cards(raw):
+    """Decode one JSON object into cards: a card itself, or a wrapper holding a list of them"""
+    try:
+        value = json.loads(raw, strict=False)
+    except json.JSONDecodeError:
+        try:
+            value = json.loads(ESCAPE_PAIR.sub(_repair_escape, raw), strict=False)
+        except json.JSONDecodeError:
+            return []
+    return list(_cards_from(value))
+
+def _repair_escape(match):
+    # Keep valid JSON escapes, turn \' into ', and make any other stray backslash literal
+    char = match.group(1)
+    if char in '"\\/bfnrtu':
+        return match.group(0)
+    if char == "'":
+        return "'"
+    return '\\\\' + char
+
+def _cards_from(value):
+    if isinstance(value, list):
+        for item in value:
+            yield from _cards_from(item)
+    elif isinstance(value, dict):
+        fields = {str(key).strip().lower(): item for key, item in value.items()}
+        if 'question' in fields and 'answer' in fields:
+            question, answer = fields['question'], fields['answer']
+            # null, numbers or nested values are model noise, not card text
+            if isinstance(question, str) and isinstance(answer, str) and question.strip() and answer.strip():
+                yield {'question': question, 'answer': answer}
+        else:
+            # e.g. {"flashcards": [...]}
+            for item in value.values():
+                if isinstance(item, (list, dict)):
+                    yield from _cards_from(item)
+
+def parse_cards(raw_text):
+    """Parse a complete model response into a list of {question, answer} cards"""
+    return CardStreamParser().feed(raw_text)
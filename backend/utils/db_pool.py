@@ -0,0 +1,88 @@
+import threading
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+from utils.metrics import DB_POOL_CHECKED_OUT, DB_POOL_CHECKOUT_SECONDS, DB_POOL_CHECKOUT_TIMEOUTS, DB_POOL_OVERFLOW
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts take and how often connections churn.
+
+    Checkout time covers waiting for a free connection, opening a new one and the
+    pre-ping, which is what a request actually spends before its first query.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'checkouts': 0,
+            'checkout_timeouts': 0,
+            'checkout_seconds_total': 0.0,
+            'checkout_seconds_max': 0.0,
+            'connections_opened': 0,
+            'connections_invalidated': 0,
+        }
+        # A pool rebuilt by engine.dispose() inherits these listeners through _dispatch
+        if '_dispatch' not in kwargs:
+            event.listen(self, 'connect', lambda *args: self._count('connections_opened'))
+            event.listen(self, 'invalidate', lambda *args: self._count('connections_invalidated'))
+
+    def recreate(self):
+        # Keep counting into the same totals so stats survive dispose() and the listeners above
+        pool = super().recreate()
+        pool._stats_lock, pool._stats = self._stats_lock, self._stats
+        return pool
+
+    def _count(self, name):
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self._count('checkout_timeouts')
+            DB_POOL_CHECKOUT_TIMEOUTS.inc()
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._stats_lock:
+                self._stats['checkouts'] += 1
+                self._stats['checkout_seconds_total'] += elapsed
+                self._stats['checkout_seconds_max'] = max(self._stats['checkout_seconds_max'], elapsed)
+            DB_POOL_CHECKOUT_SECONDS.observe(elapsed)
+            self._update_gauges()
+
+    def _do_return_conn(self, record):
+        super()._do_return_conn(record)
+        self._update_gauges()
+
+    def _update_gauges(self):
+        DB_POOL_CHECKED_OUT.set(self.checkedout())
+        DB_POOL_OVERFLOW.set(self.overflow())
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['checkout_seconds_avg'] = round(stats['checkout_seconds_total'] / stats['checkouts'], 6) if stats['checkouts'] else 0.0
+        stats['checkout_seconds_total'] = round(stats['checkout_seconds_total'], 3)
+        stats['checkout_seconds_max'] = round(stats['checkout_seconds_max'], 6)
+        return stats
+
+def pool_stats(pool):
+    """Occupancy of any QueuePool, plus checkout timings when it is instrumented"""
+    stats = {'pool_class': type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            'size': pool.size(),
+            'checked_out': pool.checkedout(),
+            'checked_in': pool.checkedin(),
+            # Negative until the pool has opened pool_size connections
+            'overflow': pool.overflow(),
+            'max_overflow': pool._max_overflow,
+            'timeout': pool.timeout(),
+        })
+    if isinstance(pool, InstrumentedQueuePool):
+        stats.update(pool.stats())
+    return stats
@@ -1,119 +1,348 @@
-import google.generativeai as genai
 import os
+import multiprocessing
+import threading
 from dotenv import load_dotenv
 import pymupdf
+from utils.card_parser import CardStreamParser, parse_cards
+from utils.gemini_client import MODEL_NAME, GENERATION_CONFIG, get_model, get_rate_limiter
+from utils.metrics import BOT_CHUNKS, BOT_PHASE_SECONDS, BOT_PROMPT_TOKENS
 import re
 import json
+import time
+import hashlib
+import codecs
+import tempfile
+import zipfile
+from xml.etree import ElementTree
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 load_dotenv()
 
+# Rough chars-per-token ratio for English text; close enough for chunk sizing
+CHARS_PER_TOKEN = 4
+CHUNK_TOKENS = int(os.getenv("GEMINI_CHUNK_TOKENS", 4000))
+MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", 4))
+REQUEST_TIMEOUT = int(os.getenv("GEMINI_REQUEST_TIMEOUT", 90))
+PAGE_BREAK = "\f"
+WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+PDF_PAGES_PER_TASK = 25
+# Per worker process, shared by every request it serves
+PDF_EXTRACT_PROCESSES = int(os.getenv("PDF_EXTRACT_PROCESSES", min(4, os.cpu_count() or 1)))
+# Extracted text beyond this is dropped, so huge uploads can't balloon the worker
+EXTRACT_MAX_CHARS = int(os.getenv("EXTRACT_MAX_CHARS", 2_000_000))
+READ_BLOCK_SIZE = 1024 * 1024
+
+# Format name -> extractor spec; see register_extractor
+EXTRACTORS = {}
+
+def _process_pool_supported():
+    # A process pool's feeder thread and pipes deadlock once gevent has monkey-patched threading
+    try:
+        from gevent import monkey
+    except ImportError:
+        return True
+    return not monkey.is_module_patched('threading')
+
+_pdf_pool = None
+_pdf_pool_pid = None
+_pdf_pool_lock = threading.Lock()
+
+def _get_pdf_pool():
+    """One extraction pool per worker process, rebuilt after a fork.
+
+    Pool processes come from a forkserver (spawn where that's unavailable), never a fork of
+    this multithreaded worker, whose other threads may hold locks at the moment of the fork.
+    """
+    global _pdf_pool, _pdf_pool_pid
+    with _pdf_pool_lock:
+        if _pdf_pool is None or _pdf_pool_pid != os.getpid():
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _pdf_pool = ProcessPoolExecutor(
+                max_workers=PDF_EXTRACT_PROCESSES,
+                mp_context=multiprocessing.get_context(method)
+            )
+            _pdf_pool_pid = os.getpid()
+    return _pdf_pool
+
+def _reset_pdf_pool(pool):
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is pool:
+            _pdf_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def register_extractor(name, extensions, signature=None, separator="", sniff=None):
+    """Register a generator that takes a file path and yields (text, seconds) segments.
+
+    Formats are detected by leading magic bytes first, then by file extension.
+    `sniff(path)`, when given, must also confirm the file before the format is chosen either way,
+    for signatures several formats share. `separator` is placed between segments when the text
+    is assembled.
+    """
+    def register(func):
+        EXTRACTORS[name] = {
+            'extract': func,
+            'extensions': extensions,
+            'signature': signature,
+            'separator': separator,
+            'sniff': sniff,
+        }
+        return func
+    return register
+
+def detect_format(path, filename):
+    with open(path, 'rb') as f:
+        head = f.read(8)
+    extension = os.path.splitext(filename or '')[1].lower()
+    candidates = [name for name, spec in EXTRACTORS.items() if spec['signature'] and head.startswith(spec['signature'])]
+    candidates += [name for name, spec in EXTRACTORS.items() if extension in spec['extensions']]
+    for name in candidates:
+        sniff = EXTRACTORS[name]['sniff']
+        if sniff is None or sniff(path):
+            return name
+    return None
+
+def _is_docx(path):
+    # Every zip container (xlsx, pptx, odt, jar) starts with PK; only a Word document has this part
+    if not zipfile.is_zipfile(path):
+        return False
+    try:
+        with zipfile.ZipFile(path) as archive:
+            return 'word/document.xml' in archive.namelist()
+    except zipfile.BadZipFile:
+        return False
+
+def _extract_page_range(path, start, stop):
+    """Extract pages [start, stop) and time each one; runs inside a pool process or inline"""
+    doc = pymupdf.open(path)
+    try:
+        pages = []
+        for number in range(start, stop):
+            started = time.perf_counter()
+            page_text = doc[number].get_text()
+            pages.append((page_text, time.perf_counter() - started))
+        return pages
+    finally:
+        doc.close()
+
+@register_extractor('pdf', ('.pdf',), signature=b'%PDF', separator=PAGE_BREAK)
+def extract_pdf(path):
+    # Page breaks let generate_flashcards chunk on page boundaries
+    with pymupdf.open(path) as doc:
+        page_count = doc.page_count
+    ranges = [
+        (start, min(start + PDF_PAGES_PER_TASK, page_count))
+        for start in range(0, page_count, PDF_PAGES_PER_TASK)
+    ]
+
+    if len(ranges) > 1 and PDF_EXTRACT_PROCESSES > 1 and _process_pool_supported():
+        # Workers open the spooled file themselves; only the path crosses the process boundary
+        pool = _get_pdf_pool()
+        try:
+            futures = [pool.submit(_extract_page_range, path, start, stop) for start, stop in ranges]
+        except BrokenProcessPool:
+            # A pool process died; start a fresh pool for the next upload and go serial for this one
+            _reset_pdf_pool(pool)
+            futures = None
+
+        if futures is not None:
+            try:
+                for index, future in enumerate(futures):
+                    try:
+                        pages = future.result()
+                    except BrokenProcessPool:
+                        _reset_pdf_pool(pool)
+                        for start, stop in ranges[index:]:
+                            yield from _extract_page_range(path, start, stop)
+                        return
+                    yield from pages
+            finally:
+                # Only this upload's queued ranges; the pool stays up for the next request
+                for future in futures:
+                    future.cancel()
+            return
+
+    for start, stop in ranges:
+        yield from _extract_page_range(path, start, stop)
+
+@register_extractor('docx', ('.docx',), signature=b'PK\x03\x04', separator="\n\n", sniff=_is_docx)
+def extract_docx(path):
+    # Stream word/document.xml and emit one paragraph at a time, freeing parsed elements
+    with zipfile.ZipFile(path) as archive, archive.open('word/document.xml') as document:
+        started = time.perf_counter()
+        parts = []
+        for event, element in ElementTree.iterparse(document, events=('end',)):
+            if element.tag == f'{WORD_NAMESPACE}t':
+                parts.append(element.text or '')
+            elif element.tag == f'{WORD_NAMESPACE}tab':
+                parts.append('\t')
+            elif element.tag == f'{WORD_NAMESPACE}p':
+                if parts:
+                    yield ''.join(parts), time.perf_counter() - started
+                parts = []
+                started = time.perf_counter()
+                element.clear()
+            elif element.tag == f'{WORD_NAMESPACE}body':
+                element.clear()
+
+@register_extractor('doc', ('.doc',), signature=b'\xd0\xcf\x11\xe0')
+def extract_doc(path):
+    # No dependable pure-Python reader for the binary Word format; fail with a clear message
+    raise ValueError("Legacy .doc files are not supported; save the document as .docx or PDF")
+
+@register_extractor('txt', ('.txt', '.md', '.csv'))
+def extract_txt(path):
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    with open(path, 'rb') as f:
+        while True:
+            started = time.perf_counter()
+            block = f.read(READ_BLOCK_SIZE)
+            text = decoder.decode(block, final=not block)
+            if text:
+                yield text, time.perf_counter() - started
+            if not block:
+                break
+
+def estimate_tokens(text):
+    return len(text) // CHARS_PER_TOKEN + 1
+
+def total_token_count(response):
+    usage = getattr(response, 'usage_metadata', None)
+    return getattr(usage, 'total_token_count', None) if usage else None
+
+def split_into_chunks(text, max_tokens=CHUNK_TOKENS):
+    """Pack pages (or paragraphs, for text without page breaks) into token-bounded chunks"""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if PAGE_BREAK in text:
+        pieces = text.split(PAGE_BREAK)
+        separator = PAGE_BREAK
+    else:
+        pieces = re.split(r'\n\s*\n', text)
+        separator = "\n\n"
+
+    chunks = []
+    current = []
+    current_len = 0
+    for piece in pieces:
+        piece = piece.strip()
+        if not piece:
+            continue
+        # A single page longer than the budget is cut at the budget
+        while len(piece) > max_chars:
+            chunks.append(piece[:max_chars])
+            piece = piece[max_chars:]
+        if current and current_len + len(piece) + len(separator) > max_chars:
+            chunks.append(separator.join(current))
+            current = []
+            current_len = 0
+        current.append(piece)
+        current_len += len(piece) + len(separator)
+    if current:
+        chunks.append(separator.join(current))
+    return chunks
+
+def question_key(card):
+    return re.sub(r'\s+', ' ', str(card.get('question', ''))).strip().lower()
+
+def dedupe_flashcards(flashcards):
+    """Drop cards whose question repeats an earlier one, ignoring case and spacing"""
+    seen = set()
+    unique = []
+    for card in flashcards:
+        key = question_key(card)
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(card)
+    return unique
+
 class FlashlyBot:
     def __init__(self):
-        GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-        genai.configure(api_key=GEMINI_API_KEY)
-        
-        generation_config = {
-            "temperature": 0.9,
-            "top_p": 1,
-            "top_k": 1,
-            "max_output_tokens": 8192,
-        }
+        # The model and rate limiter are shared by every bot in this worker process
+        self.model_name = MODEL_NAME
+        self.generation_config = GENERATION_CONFIG
+        self.model = get_model()
+        self.limiter = get_rate_limiter()
         
-        self.model = genai.GenerativeModel(
-            'gemini-1.5-flash',
-            generation_config=generation_config
-        )
+        # Timings from the most recent extract_text / generate_flashcards calls
+        self.last_extraction_report = None
+        self.last_generation_report = []
     
     def extract_text(self, file):
+        text, self.last_extraction_report = self.extract_text_with_report(file)
+        return text
+    
+    def extract_text_with_report(self, file):
+        """Extract text from a PDF, DOCX or TXT upload; returns (text, timing report)"""
+        started = time.perf_counter()
+        path = None
         try:
-            file_stream = file.stream 
-            doc = pymupdf.open(stream=file_stream.read(), filetype="pdf")
-            text = ""
-            page_count = 0
+            # Spool the upload to disk in blocks rather than holding it in memory
+            with tempfile.NamedTemporaryFile(prefix='flashly-upload-', delete=False) as spool:
+                path = spool.name
+                while block := file.stream.read(READ_BLOCK_SIZE):
+                    spool.write(block)
+            
+            file_format = detect_format(path, file.filename)
+            if file_format is None:
+                raise ValueError("Unsupported file type; upload a PDF, DOCX or TXT file")
+            spec = EXTRACTORS[file_format]
+            
+            segments = []
+            timings = []
+            characters = 0
+            truncated = False
+            extractor = spec['extract'](path)
+            try:
+                for segment_text, seconds in extractor:
+                    if characters + len(segment_text) > EXTRACT_MAX_CHARS:
+                        segment_text = segment_text[:EXTRACT_MAX_CHARS - characters]
+                        truncated = True
+                    segments.append(segment_text)
+                    timings.append((len(segment_text), seconds))
+                    characters += len(segment_text)
+                    if truncated:
+                        break
+            finally:
+                extractor.close()
             
-            for page in doc:
-                text += page.get_text()
-                page_count += 1
-                
-            print(f"📝 Extracted {len(text)} characters from {page_count} pages")  # ✅ ADD: Helpful logging
-            doc.close()
-            return text
+            text = spec['separator'].join(segments)
+            report = {
+                'format': file_format,
+                'page_count': len(segments) if file_format == 'pdf' else None,
+                'characters': len(text),
+                'truncated': truncated,
+                'seconds': round(time.perf_counter() - started, 3),
+                'pages': [
+                    {'page': number + 1, 'characters': length, 'seconds': round(seconds, 4)}
+                    for number, (length, seconds) in enumerate(timings)
+                ] if file_format == 'pdf' else [],
+            }
+            
+            BOT_PHASE_SECONDS.labels('extraction').observe(time.perf_counter() - started)
+            print(f"📝 Extracted {len(text)} characters from {len(segments)} {file_format} segments in {report['seconds']}s")
+            return text, report
+        except ValueError:
+            raise
         except Exception as e:
             print(f"❌ Error extracting text: {e}")
-            return ""
+            return "", {'format': None, 'page_count': 0, 'characters': 0, 'truncated': False, 'seconds': round(time.perf_counter() - started, 3), 'pages': []}
+        finally:
+            if path:
+                os.remove(path)
     
     def clean_gemini_output(self, raw_text):
-        # Print the raw response for debugging
-        print(f"Raw response first 100 chars: {raw_text[:100]}")
-        
-        # Remove unwanted characters like code fences, backticks, extra spaces
-        cleaned_text = raw_text.strip()
-        cleaned_text = cleaned_text.replace('```json', '').replace('```', '').strip()
-        
-        # Check if the text already has escaped quotes
-        if '\\\"' in cleaned_text or '\\\"question' in cleaned_text:
-            # If quotes are already escaped, we need to unescape them for json.loads
-            cleaned_text = cleaned_text.replace('\\"', '"')
-        
-        # Try to extract a valid JSON array using regex
-        json_pattern = r'\[\s*\{.*\}\s*\]'
-        json_match = re.search(json_pattern, cleaned_text, re.DOTALL)
-        if json_match:
-            cleaned_text = json_match.group(0)
-        
-        # Manual character replacement for common issues
-        cleaned_text = cleaned_text.replace(' g', 'ng')
-        cleaned_text = cleaned_text.replace(' i ', ' in ')
-        cleaned_text = cleaned_text.replace(' itor', 'nitor')
-        
-        # Fix common JSON structure issues
-        cleaned_text = re.sub(r'\}\s*\{', '},{', cleaned_text)
-        
-        # Ensure the text is surrounded by square brackets for an array
-        if not cleaned_text.startswith('['):
-            cleaned_text = '[' + cleaned_text
-        if not cleaned_text.endswith(']'):
-            cleaned_text = cleaned_text + ']'
-        
-        # Extract and reconstruct the JSON manually
-        try:
-            # Try direct parsing first
-            flashcards = json.loads(cleaned_text)
-            return flashcards
-        except json.JSONDecodeError as e:
-            print(f"❌ Error parsing JSON: {e}")
-            print(cleaned_text[:100] + "..." if len(cleaned_text) > 100 else cleaned_text)
-            
-            # Try a completely different approach: manually extract JSON objects
-            try:
-                # Extract all pairs of "question": "text", "answer": "text"
-                question_pattern = r'"question"\s*:\s*"([^"]*)"'
-                answer_pattern = r'"answer"\s*:\s*"([^"]*)"'
-                
-                questions = re.findall(question_pattern, cleaned_text)
-                answers = re.findall(answer_pattern, cleaned_text)
-                
-                if questions and answers and len(questions) == len(answers):
-                    result = []
-                    for i in range(len(questions)):
-                        result.append({"question": questions[i], "answer": answers[i]})
-                    return result
-            except Exception as e2:
-                print(f"Pattern extraction failed: {e2}")
-            
-            # Final attempt: try to fix the JSON with a more aggressive approach
-            try:
-                # Remove all whitespace and then add minimal formatting back
-                no_space = cleaned_text.replace(" ", "").replace("\n", "")
-                fixed = no_space.replace('},{', '}, {')
-                return json.loads(fixed)
-            except Exception as e3:
-                print(f"Final attempt failed: {e3}")
-                
+        """Recover every complete card from a model response in one linear pass"""
+        with BOT_PHASE_SECONDS.labels('parse').time():
+            flashcards = parse_cards(raw_text)
+        if not flashcards:
+            print(f"❌ No flashcards found in response: {raw_text[:100]}")
             return None
+        return flashcards
     
-    def generate_flashcards(self, text):
-        prompt = f"""
+    def build_prompt(self, text):
+        return f"""
             You are an AI trained to create flashcards for studying.
             Given the input text, generate flashcards in the following strict JSON format:
             [
@@ -144,13 +373,90 @@ class FlashlyBot:
             {text}
             ---
         """
+
+    def cache_key(self, text):
+        """Content address for a generation: same text, prompt and config give the same cards"""
+        fingerprint = json.dumps({
+            'model': self.model_name,
+            'generation_config': self.generation_config,
+            'prompt': self.build_prompt(''),
+            'chunk_tokens': CHUNK_TOKENS,
+        }, sort_keys=True)
+        return hashlib.sha256((fingerprint + text).encode('utf-8')).hexdigest()
+
+    def _generate_chunk(self, index, chunk):
+        started = time.perf_counter()
+        report = {'chunk': index, 'characters': len(chunk), 'flashcards': 0, 'error': None}
+        try:
+            prompt = self.build_prompt(chunk)
+            estimated_tokens = estimate_tokens(prompt)
+            BOT_PROMPT_TOKENS.observe(estimated_tokens)
+            with self.limiter.limit(estimated_tokens):
+                with BOT_PHASE_SECONDS.labels('generation').time():
+                    response = self.model.generate_content(
+                        prompt,
+                        request_options={'timeout': REQUEST_TIMEOUT}
+                    )
+            self.limiter.record_usage(estimated_tokens, total_token_count(response))
+            flashcards = self.clean_gemini_output(response.text) or []
+            report['flashcards'] = len(flashcards)
+            BOT_CHUNKS.labels('ok' if flashcards else 'empty').inc()
+        except Exception as e:
+            print(f"❌ Error generating flashcards for chunk {index}: {e}")
+            flashcards = []
+            report['error'] = str(e)
+            BOT_CHUNKS.labels('error').inc()
+        report['seconds'] = round(time.perf_counter() - started, 3)
+        return flashcards, report
+    
+    def generate_flashcards(self, text):
+        chunks = split_into_chunks(text)
+        if not chunks:
+            self.last_generation_report = []
+            return None
         
         try:
-            response = self.model.generate_content(prompt)
-            flashcards = self.clean_gemini_output(response.text)
+            # Chunks run concurrently, bounded by MAX_CONCURRENCY; map keeps document order
+            with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENCY, len(chunks))) as pool:
+                results = list(pool.map(self._generate_chunk, range(len(chunks)), chunks))
+            
+            self.last_generation_report = [report for _, report in results]
+            flashcards = dedupe_flashcards([card for cards, _ in results for card in cards])
+            
             if flashcards:
-                print(f"✅ Generated {len(flashcards)} unlimited flashcards!")
-            return flashcards
+                print(f"✅ Generated {len(flashcards)} unlimited flashcards from {len(chunks)} chunks!")
+            return flashcards or None
         except Exception as e:
             print(f"❌ Error generating flashcards: {e}")
-            return None
\ No newline at end of file
+            return None
+    
+    def stream_flashcards(self, text):
+        """Yield unique flashcards as Gemini streams them, chunk by chunk in document order"""
+        seen = set()
+        for index, chunk in enumerate(split_into_chunks(text)):
+            parser = CardStreamParser()
+            try:
+                prompt = self.build_prompt(chunk)
+                estimated_tokens = estimate_tokens(prompt)
+                BOT_PROMPT_TOKENS.observe(estimated_tokens)
+                # The in-flight slot is held until the stream is fully consumed
+                with self.limiter.limit(estimated_tokens):
+                    # Generation and incremental parsing interleave here, so the phase covers both
+                    started = time.perf_counter()
+                    response = self.model.generate_content(
+                        prompt,
+                        stream=True,
+                        request_options={'timeout': REQUEST_TIMEOUT}
+                    )
+                    for part in response:
+                        for card in parser.feed(part.text):
+                            key = question_key(card)
+                            if key not in seen:
+                                seen.add(key)
+                                yield card
+                    BOT_PHASE_SECONDS.labels('generation').observe(time.perf_counter() - started)
+                self.limiter.record_usage(estimated_tokens, total_token_count(response))
+                BOT_CHUNKS.labels('ok').inc()
+            except Exception as e:
+                print(f"❌ Error streaming flashcards for chunk {index}: {e}")
+                BOT_CHUNKS.labels('error').inc()
\ No newline at end of file
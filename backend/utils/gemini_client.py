@@ -0,0 +1,165 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+import google.generativeai as genai
+from dotenv import load_dotenv
+from utils.metrics import BOT_PHASE_SECONDS
+
+load_dotenv()
+
+MODEL_NAME = 'gemini-1.5-flash'
+GENERATION_CONFIG = {
+    "temperature": 0.9,
+    "top_p": 1,
+    "top_k": 1,
+    "max_output_tokens": 8192,
+}
+
+# Budgets are per worker process; divide the project quota by the number of workers
+GEMINI_RPM = int(os.getenv("GEMINI_RPM", 15))
+GEMINI_TPM = int(os.getenv("GEMINI_TPM", 1_000_000))
+GEMINI_MAX_INFLIGHT = int(os.getenv("GEMINI_MAX_INFLIGHT", 4))
+GEMINI_MAX_WAIT = float(os.getenv("GEMINI_MAX_WAIT", 60))
+
+class RateLimitExceeded(Exception):
+    """Raised when a Gemini call would have to wait longer than GEMINI_MAX_WAIT, for budget or an in-flight slot"""
+
+class TokenBucket:
+    """Refills continuously at `per_minute` units per minute up to a one-minute burst"""
+
+    def __init__(self, per_minute):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.level = float(per_minute)
+        self.updated = time.monotonic()
+
+    def refill(self, now):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def seconds_until(self, amount, now):
+        self.refill(now)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount):
+        # May go negative when actual usage exceeds the estimate; later callers pay it back
+        self.level -= amount
+
+class GeminiRateLimiter:
+    """Requests-per-minute and tokens-per-minute buckets plus a cap on in-flight calls"""
+
+    def __init__(self, rpm=GEMINI_RPM, tpm=GEMINI_TPM, max_inflight=GEMINI_MAX_INFLIGHT, max_wait=GEMINI_MAX_WAIT):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.max_wait = max_wait
+        self.max_inflight = max_inflight
+        self._condition = threading.Condition()
+        self._inflight = threading.BoundedSemaphore(max_inflight)
+        self._stats = {
+            'acquired': 0,
+            'rejected': 0,
+            'waited': 0,
+            'wait_seconds_total': 0.0,
+            'wait_seconds_max': 0.0,
+            'inflight': 0,
+        }
+
+    def acquire(self, estimated_tokens):
+        """Block until both buckets allow the call; returns seconds spent waiting"""
+        # A single request can never need more than a full minute of tokens
+        amount = min(estimated_tokens, self.tokens.capacity)
+        started = time.monotonic()
+        deadline = started + self.max_wait
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                wait = max(self.requests.seconds_until(1, now), self.tokens.seconds_until(amount, now))
+                if wait <= 0:
+                    self.requests.take(1)
+                    self.tokens.take(amount)
+                    break
+                if now + wait > deadline:
+                    self._stats['rejected'] += 1
+                    raise RateLimitExceeded(f"Gemini rate limit: would wait {wait:.1f}s (max {self.max_wait}s)")
+                self._condition.wait(wait)
+
+            waited = time.monotonic() - started
+            BOT_PHASE_SECONDS.labels('rate_limit_wait').observe(waited)
+            self._stats['acquired'] += 1
+            if waited > 0.001:
+                self._stats['waited'] += 1
+                self._stats['wait_seconds_total'] += waited
+                self._stats['wait_seconds_max'] = max(self._stats['wait_seconds_max'], waited)
+        return waited
+
+    def record_usage(self, estimated_tokens, actual_tokens):
+        """Settle the token bucket once the response reports real usage"""
+        if actual_tokens is None:
+            return
+        with self._condition:
+            self.tokens.take(actual_tokens - min(estimated_tokens, self.tokens.capacity))
+
+    @contextmanager
+    def limit(self, estimated_tokens):
+        started = time.monotonic()
+        self.acquire(estimated_tokens)
+        # The in-flight slot shares the caller's GEMINI_MAX_WAIT budget with the buckets
+        remaining = max(0.0, self.max_wait - (time.monotonic() - started))
+        if not self._inflight.acquire(timeout=remaining):
+            with self._condition:
+                # The call never goes out, so hand back what acquire() took and counted
+                self._stats['acquired'] -= 1
+                self._stats['rejected'] += 1
+                self.requests.take(-1)
+                self.tokens.take(-min(estimated_tokens, self.tokens.capacity))
+                self._condition.notify_all()
+            raise RateLimitExceeded(
+                f"Gemini rate limit: all {self.max_inflight} in-flight slots busy for {self.max_wait}s"
+            )
+        with self._condition:
+            self._stats['inflight'] += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._stats['inflight'] -= 1
+            self._inflight.release()
+
+    def stats(self):
+        with self._condition:
+            now = time.monotonic()
+            stats = dict(self._stats)
+            stats['wait_seconds_total'] = round(stats['wait_seconds_total'], 3)
+            stats['wait_seconds_max'] = round(stats['wait_seconds_max'], 3)
+            stats['wait_seconds_avg'] = round(stats['wait_seconds_total'] / stats['waited'], 3) if stats['waited'] else 0.0
+            self.requests.refill(now)
+            self.tokens.refill(now)
+            stats['requests_available'] = round(self.requests.level, 2)
+            stats['tokens_available'] = round(self.tokens.level)
+            return stats
+
+_registry = {'pid': None, 'model': None, 'limiter': None}
+_registry_lock = threading.Lock()
+
+def _ensure_registry():
+    # Built lazily and rebuilt in a forked child so no worker inherits another's gRPC channel or locks
+    pid = os.getpid()
+    if _registry['pid'] != pid:
+        with _registry_lock:
+            if _registry['pid'] != pid:
+                genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+                _registry['model'] = genai.GenerativeModel(MODEL_NAME, generation_config=GENERATION_CONFIG)
+                _registry['limiter'] = GeminiRateLimiter()
+                _registry['pid'] = pid
+    return _registry
+
+def get_model():
+    """The process-wide GenerativeModel"""
+    return _ensure_registry()['model']
+
+def get_rate_limiter():
+    """The process-wide Gemini rate limiter"""
+    return _ensure_registry()['limiter']
@@ -0,0 +1,66 @@
+import threading
+import time
+from collections import OrderedDict
+from utils.metrics import record_cache_lookup
+
+class LRUCache:
+    """Thread-safe in-process LRU with optional per-entry TTL and hit/miss counters.
+
+    A `name` also reports lookups to the flashly_cache_lookups_total metric.
+    """
+
+    def __init__(self, maxsize=256, ttl=None, name=None):
+        self.maxsize = maxsize
+        self.name = name
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            hit = entry is not None and (entry[1] is None or entry[1] > time.monotonic())
+            if hit:
+                self._data.move_to_end(key)
+                self.hits += 1
+            else:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+        if self.name:
+            record_cache_lookup(self.name, hit)
+        return entry[0] if hit else default
+
+    def set(self, key, value, ttl=None):
+        """Store value; `ttl` overrides the cache-wide TTL for this entry"""
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def __len__(self):
+        return len(self._data)
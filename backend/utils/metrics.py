@@ -0,0 +1,86 @@
+import os
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+)
+
+# With PROMETHEUS_MULTIPROC_DIR set (gunicorn.conf.py does it), every worker writes its samples
+# to files there and a scrape of any worker sums them; otherwise metrics live in this process only
+
+HTTP_REQUEST_SECONDS = Histogram(
+    'flashly_http_request_duration_seconds',
+    'API request latency',
+    ['endpoint', 'method', 'status'],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+
+BOT_PHASE_SECONDS = Histogram(
+    'flashly_bot_phase_seconds',
+    'FlashlyBot time per phase: extraction per upload, rate_limit_wait, generation and parse per Gemini call',
+    ['phase'],
+    buckets=(0.005, 0.025, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 90, 120),
+)
+
+BOT_PROMPT_TOKENS = Histogram(
+    'flashly_bot_prompt_tokens',
+    'Estimated prompt size per Gemini call',
+    buckets=(250, 500, 1000, 2000, 4000, 8000, 16000, 32000),
+)
+
+BOT_CHUNKS = Counter(
+    'flashly_bot_chunks_total',
+    'Gemini calls by outcome',
+    ['outcome'],
+)
+
+CACHE_LOOKUPS = Counter(
+    'flashly_cache_lookups_total',
+    'Cache lookups by cache and result; hit ratio = hit / (hit + miss)',
+    ['cache', 'result'],
+)
+
+DB_POOL_CHECKED_OUT = Gauge(
+    'flashly_db_pool_checked_out',
+    'Connections currently checked out',
+    multiprocess_mode='livesum',
+)
+
+DB_POOL_OVERFLOW = Gauge(
+    'flashly_db_pool_overflow',
+    'Connections open beyond pool_size (negative while the pool is still filling)',
+    multiprocess_mode='livesum',
+)
+
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    'flashly_db_pool_checkout_seconds',
+    'Time to check a connection out of the pool, including waits and pre-ping',
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10),
+)
+
+DB_POOL_CHECKOUT_TIMEOUTS = Counter(
+    'flashly_db_pool_checkout_timeouts_total',
+    'Checkouts that gave up waiting for a free connection',
+)
+
+REVIEW_EVENTS = Counter(
+    'flashly_review_events_total',
+    'Review events by outcome: applied, skipped (card gone or not in the set) or dropped (flush failed)',
+    ['outcome'],
+)
+
+REVIEW_FLUSH_SECONDS = Histogram(
+    'flashly_review_flush_seconds',
+    'Time to write one batch of review events and reschedule their cards',
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+
+def record_cache_lookup(cache, hit):
+    CACHE_LOOKUPS.labels(cache, 'hit' if hit else 'miss').inc()
+
+def render_metrics():
+    """Exposition text for every worker's metrics; returns (body, content type)"""
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
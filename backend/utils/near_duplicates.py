@@ -0,0 +1,82 @@
+import hashlib
+import re
+from array import array
+
+# 32 MinHash bins in 8 LSH bands of 4: pairs above ~0.6 Jaccard become candidates,
+# and candidates are confirmed against SIMILARITY_THRESHOLD on the full signature
+NUM_PERMUTATIONS = 32
+BANDS = 8
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+SIMILARITY_THRESHOLD = 0.75
+SHINGLE_SIZE = 4
+
+_EMPTY = (1 << 32) - 1
+_ITEM_SIZE = array('I').itemsize
+
+def normalize(text):
+    return ' '.join(re.sub(r'[^\w]+', ' ', str(text).lower()).split())
+
+def shingles(text):
+    """Character shingles of the normalized text"""
+    normalized = normalize(text)
+    if len(normalized) <= SHINGLE_SIZE:
+        return {normalized}
+    return {normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)}
+
+def minhash(text):
+    """MinHash signature of a card's question, packed as bytes for storage.
+
+    Uses one-permutation hashing: each shingle hash picks a bin with its low bits and
+    competes for that bin's minimum with its high bits, so the cost is linear in the
+    number of shingles rather than shingles x permutations. Empty bins borrow from the
+    next filled bin so short questions still get a full signature.
+    """
+    bins = [_EMPTY] * NUM_PERMUTATIONS
+    for shingle in shingles(text):
+        h = int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), 'little')
+        index = h % NUM_PERMUTATIONS
+        value = (h >> 32) & _EMPTY
+        if value < bins[index]:
+            bins[index] = value
+
+    filled = [i for i, value in enumerate(bins) if value != _EMPTY]
+    if filled:
+        for i in range(NUM_PERMUTATIONS):
+            if bins[i] == _EMPTY:
+                source = next((j for j in filled if j > i), filled[0])
+                bins[i] = bins[source]
+    return array('I', bins).tobytes()
+
+def similarity(signature, other):
+    """Estimated Jaccard similarity of two packed signatures"""
+    left = array('I', signature)
+    right = array('I', other)
+    return sum(1 for x, y in zip(left, right) if x == y) / NUM_PERMUTATIONS
+
+class NearDuplicateIndex:
+    """LSH buckets over MinHash signatures; add and lookup are O(bands) per card"""
+
+    def __init__(self):
+        self._buckets = {}
+        self._signatures = {}
+
+    def _band_keys(self, signature):
+        band_bytes = ROWS_PER_BAND * _ITEM_SIZE
+        return [(band, signature[band * band_bytes:(band + 1) * band_bytes]) for band in range(BANDS)]
+
+    def add(self, key, signature):
+        self._signatures[key] = signature
+        for band_key in self._band_keys(signature):
+            self._buckets.setdefault(band_key, []).append(key)
+
+    def find(self, signature):
+        """Key of an indexed near-duplicate of `signature`, or None"""
+        checked = set()
+        for band_key in self._band_keys(signature):
+            for key in self._buckets.get(band_key, ()):
+                if key in checked:
+                    continue
+                checked.add(key)
+                if similarity(signature, self._signatures[key]) >= SIMILARITY_THRESHOLD:
+                    return key
+        return None
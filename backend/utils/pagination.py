@@ -0,0 +1,49 @@
+import base64
+import uuid
+from datetime import datetime
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+def _encode(raw):
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+def _decode(cursor):
+    padded = cursor + '=' * (-len(cursor) % 4)
+    return base64.urlsafe_b64decode(padded.encode()).decode()
+
+def encode_cursor(timestamp, row_id):
+    """Encode a (timestamp, id) keyset position as an opaque URL-safe token"""
+    return _encode(f"{timestamp.isoformat()}|{row_id}")
+
+def decode_cursor(cursor):
+    """Decode a token produced by encode_cursor back into (timestamp, uuid)"""
+    try:
+        timestamp, row_id = _decode(cursor).split('|', 1)
+        return datetime.fromisoformat(timestamp), uuid.UUID(row_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+
+def encode_rank_cursor(rank, row_id):
+    """Encode a (rank, id) keyset position; repr keeps the float exact so no tie is skipped"""
+    return _encode(f"{rank!r}|{row_id}")
+
+def decode_rank_cursor(cursor):
+    """Decode a token produced by encode_rank_cursor back into (float, uuid)"""
+    try:
+        rank, row_id = _decode(cursor).split('|', 1)
+        return float(rank), uuid.UUID(row_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+
+def parse_limit(value, default=None):
+    """Parse a ?limit= query value, clamped to MAX_PAGE_SIZE"""
+    if value is None or value == '':
+        return default
+    try:
+        limit = int(value)
+    except (TypeError, ValueError) as e:
+        raise ValueError("limit must be an integer") from e
+    if limit < 1:
+        raise ValueError("limit must be a positive integer")
+    return min(limit, MAX_PAGE_SIZE)
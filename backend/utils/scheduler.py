@@ -0,0 +1,41 @@
+from datetime import timedelta
+
+# SM-2 spaced repetition. Grades use SM-2's 0-5 quality scale; the study UI's four buttons map onto it
+GRADES = {'again': 1, 'hard': 3, 'good': 4, 'easy': 5}
+PASSING_GRADE = 3
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+FIRST_INTERVAL_DAYS = 1
+SECOND_INTERVAL_DAYS = 6
+# A failed card comes back within the same session instead of tomorrow
+RELEARN_DELAY = timedelta(minutes=10)
+
+def parse_grade(value):
+    """A 0-5 quality from a button name or number; raises ValueError for anything else"""
+    if isinstance(value, str) and value.strip().lower() in GRADES:
+        return GRADES[value.strip().lower()]
+    if isinstance(value, bool):
+        raise ValueError(f"Invalid grade: {value!r}")
+    try:
+        grade = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid grade: {value!r}")
+    if not 0 <= grade <= 5:
+        raise ValueError(f"Grade must be between 0 and 5, got {grade}")
+    return grade
+
+def next_review(repetitions, interval_days, ease_factor, lapses, grade, now):
+    """Apply one SM-2 review; returns the new (repetitions, interval_days, ease_factor, lapses, due_at)"""
+    # The ease update applies to every grade, failed or not
+    ease_factor = max(MIN_EASE, ease_factor + 0.1 - (5 - grade) * (0.08 + (5 - grade) * 0.02))
+
+    if grade < PASSING_GRADE:
+        return 0, 0.0, ease_factor, lapses + 1, now + RELEARN_DELAY
+
+    if repetitions == 0:
+        interval_days = FIRST_INTERVAL_DAYS
+    elif repetitions == 1:
+        interval_days = SECOND_INTERVAL_DAYS
+    else:
+        interval_days = round(interval_days * ease_factor, 2)
+    return repetitions + 1, float(interval_days), ease_factor, lapses, now + timedelta(days=interval_days)
@@ -11,7 +11,7 @@ import {
   Loader,
 } from "lucide-react";
 import { toast } from "react-toastify";
-import { apiRequestJson, apiRequest } from "../utils/api";
+import { apiRequestJson, apiRequest, pollJob } from "../utils/api";
 
 const GeneratePage = () => {
   const navigate = useNavigate();
@@ -156,13 +156,15 @@ const GeneratePage = () => {
       const generateFormData = new FormData();
       generateFormData.append("file", selectedFile);
 
-      const previewData = await apiRequestJson(
-        `/studysets/${studySet.id}/flashcards/preview`,
+      // Generation runs as a background job so the API stays responsive
+      const job = await apiRequestJson(
+        `/studysets/${studySet.id}/flashcards/preview?async=1`,
         {
           method: "POST",
           body: generateFormData,
         }
       );
+      const previewData = await pollJob(job.id);
 
       toast.success(
         `Generated ${previewData.flashcards.length} flashcards from your file!`
@@ -133,6 +133,7 @@ const StudySetPage = () => {
           method: "PUT",
           body: JSON.stringify({
             flashcards: editingFlashcards,
+            return_all: true,
           }),
         }
       );
@@ -47,3 +47,13 @@ export const apiRequestJson = async (endpoint, options = {}) => {
 
   return response.json();
 };
+
+// Poll a background job until it finishes, resolving with its result
+export const pollJob = async (jobId, interval = 2000) => {
+  for (;;) {
+    const job = await apiRequestJson(`/jobs/${jobId}`);
+    if (job.status === "succeeded") return job.result;
+    if (job.status === "failed") throw new Error(job.error || "Job failed");
+    await new Promise((resolve) => setTimeout(resolve, interval));
+  }
+};